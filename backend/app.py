@@ -3,11 +3,51 @@ Stellar Compass - Universal DeFi Assistant Backend
 Serves both frontend and API endpoints
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify
 from flask_cors import CORS
 from stellar_sdk import Server, Asset
+import atexit
+import contextlib
+import functools
+import json
 import os
+import queue
+import threading
+import time
+import logging
+import logging.handlers
+from concurrent.futures import Future as ConcurrentFuture, ThreadPoolExecutor
+
+from stellar_cache import TTLCache
+
+# Redis is optional - without it (or REDIS_URL) we fall back to an
+# in-process TTL cache
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Twilio is optional - SMS is skipped when it isn't installed
+try:
+    from twilio.rest import Client as TwilioClient
+except ImportError:
+    TwilioClient = None
+
+# Response compression is optional but recommended for large portfolios
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+# orjson serializes large balance arrays several times faster than the
+# stdlib encoder behind jsonify; fall back when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from dotenv import load_dotenv
+import jinja2
+import numpy as np
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -16,19 +56,155 @@ from pathlib import Path
 # Load environment variables
 load_dotenv()
 
+# Buffered logging: records go onto an in-memory queue and a background
+# listener thread does the actual stdout writes, so request threads never
+# serialize on the stream lock
+_LOG_QUEUE = queue.Queue(-1)
+_LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, logging.StreamHandler())
+_LOG_LISTENER.start()
+atexit.register(_LOG_LISTENER.stop)
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(message)s',
+                    handlers=[logging.handlers.QueueHandler(_LOG_QUEUE)])
+logger = logging.getLogger(__name__)
+
+
+def fast_jsonify(data, status=200):
+    """Serialize a JSON response with orjson when available"""
+    if orjson is None:
+        response = jsonify(data)
+        response.status_code = status
+        return response
+    return app.response_class(orjson.dumps(data), status=status,
+                              mimetype='application/json')
+
 # Get the parent directory (project root)
 BASE_DIR = Path(__file__).parent.parent
+FRONTEND_DIR = BASE_DIR / 'frontend'
 
 # Initialize Flask app with frontend folder
-app = Flask(__name__, 
-            static_folder=str(BASE_DIR / 'frontend'),
+app = Flask(__name__,
+            static_folder=str(FRONTEND_DIR),
             static_url_path='')
 CORS(app)
 
+# Let browsers cache static assets. One hour, not a year: app.js and
+# styles.css aren't content-hashed, so a long max-age would pin stale
+# frontends on users' machines
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
+
+# Compress large JSON/asset responses (portfolio payloads are verbose)
+if Compress is not None:
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    Compress(app)
+
+# SPA entry point, read once at startup instead of on every fallback hit
+_INDEX_HTML = (FRONTEND_DIR / 'index.html').read_bytes()
+
 # Stellar network configuration
 HORIZON_URL = "https://horizon.stellar.org"
 horizon = Server(HORIZON_URL)
 
+# Horizon response caching - dashboards poll the same account every few
+# seconds, so short TTLs cut most of the redundant round trips
+ACCOUNT_CACHE_TTL = int(os.getenv('ACCOUNT_CACHE_TTL', '15'))  # seconds
+
+REDIS_CLIENT = None
+if redis is not None and os.getenv('REDIS_URL'):
+    try:
+        REDIS_CLIENT = redis.Redis.from_url(os.getenv('REDIS_URL'))
+        REDIS_CLIENT.ping()
+    except Exception as e:
+        logger.warning("⚠️  Redis unavailable, using in-process cache: %s", e)
+        REDIS_CLIENT = None
+
+# Bounded fallback cache. Entries are kept well past ACCOUNT_CACHE_TTL
+# (matching the Redis setex path) so stale-if-error still has something
+# to serve, and the maxsize stops distinct accounts from accumulating
+# forever in a long-running server
+_LOCAL_CACHE = TTLCache(maxsize=10_000, ttl=ACCOUNT_CACHE_TTL * 20)
+
+# In-flight account fetches, keyed by cache key, so a burst of identical
+# requests shares one Horizon round trip instead of issuing N
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _cache_read(key):
+    """Return (body, timestamp) for a cached entry, or None"""
+    if REDIS_CLIENT is not None:
+        try:
+            raw = REDIS_CLIENT.get(key)
+            if raw:
+                entry = json.loads(raw)
+                return entry['body'], entry['ts']
+        except Exception:
+            pass
+        return None
+    return _LOCAL_CACHE.get(key)
+
+
+def _cache_write(key, body, ts, ttl):
+    if REDIS_CLIENT is not None:
+        try:
+            # Keep stale entries around a while longer for stale-if-error
+            REDIS_CLIENT.setex(key, ttl * 20, json.dumps({'body': body, 'ts': ts}))
+        except Exception:
+            pass
+        return
+    # Same stale-retention window as the Redis path
+    _LOCAL_CACHE.set(key, (body, ts), ttl=ttl * 20)
+
+
+def _fetch_account(public_key):
+    """Fetch a Horizon account, served from cache when fresh.
+
+    Returns (account, stale). On a Horizon error a stale cached copy is
+    returned instead of failing ("stale-if-error").
+    """
+    key = f"horizon:account:{public_key}"
+    now = time.time()
+
+    cached = _cache_read(key)
+    if cached is not None and now - cached[1] < ACCOUNT_CACHE_TTL:
+        return cached[0], False
+
+    # Single-flight: if another thread is already fetching this account,
+    # wait for its result instead of issuing a duplicate request
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        if future is not None:
+            owner = False
+        else:
+            future = ConcurrentFuture()
+            _INFLIGHT[key] = future
+            owner = True
+
+    if not owner:
+        return future.result()
+
+    try:
+        try:
+            account = horizon.accounts().account_id(public_key).call()
+        except Exception as e:
+            if cached is not None:
+                logger.warning("⚠️  Horizon error - serving stale account data for %s...", public_key[:8])
+                result = (cached[0], True)
+                future.set_result(result)
+                return result
+            future.set_exception(e)
+            raise
+
+        _cache_write(key, account, now, ACCOUNT_CACHE_TTL)
+        result = (account, False)
+        future.set_result(result)
+        return result
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
 # Email configuration
 EMAIL_ADDRESS = os.getenv('EMAIL_ADDRESS')
 EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD')
@@ -40,15 +216,21 @@ TWILIO_AUTH_TOKEN = os.getenv('TWILIO_AUTH_TOKEN')
 TWILIO_PHONE_NUMBER = os.getenv('TWILIO_PHONE_NUMBER')
 USER_PHONE = os.getenv('USER_PHONE')
 
-print("🚀 Starting Stellar Compass API Server...")
-print("📡 API available at: http://localhost:5000")
-print("🌐 CORS enabled for frontend requests")
-print("\n🔔 Notifications Status:")
-print(f"   📧 Email: {'✅ Enabled' if EMAIL_ADDRESS and EMAIL_PASSWORD else '❌ Not configured'}")
-print(f"   📱 SMS: {'✅ Enabled' if TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN else '❌ Not configured'}")
-print(f"\n💡 Connected to Stellar {HORIZON_URL}")
-print(f"📁 Serving frontend from: {BASE_DIR / 'frontend'}")
-print("-" * 50)
+# One Twilio client for the whole process - its underlying requests.Session
+# keeps the TLS connection to api.twilio.com alive across messages
+TWILIO_CLIENT = None
+if TwilioClient is not None and TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN:
+    TWILIO_CLIENT = TwilioClient(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+
+logger.info("🚀 Starting Stellar Compass API Server...")
+logger.info("📡 API available at: http://localhost:5000")
+logger.info("🌐 CORS enabled for frontend requests")
+logger.info("\n🔔 Notifications Status:")
+logger.info("   📧 Email: %s", '✅ Enabled' if EMAIL_ADDRESS and EMAIL_PASSWORD else '❌ Not configured')
+logger.info("   📱 SMS: %s", '✅ Enabled' if TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN else '❌ Not configured')
+logger.info("\n💡 Connected to Stellar %s", HORIZON_URL)
+logger.info("📁 Serving frontend from: %s", FRONTEND_DIR)
+logger.info("-" * 50)
 
 
 # ============================================
@@ -58,27 +240,231 @@ print("-" * 50)
 @app.route('/')
 def index():
     """Serve the main frontend page"""
-    return send_from_directory(str(BASE_DIR / 'frontend'), 'index.html')
+    return app.response_class(_INDEX_HTML, mimetype='text/html')
 
-@app.route('/<path:path>')
-def serve_static(path):
-    """Serve static frontend files"""
-    try:
-        return send_from_directory(str(BASE_DIR / 'frontend'), path)
-    except:
-        # If file not found, return index.html (for SPA routing)
-        return send_from_directory(str(BASE_DIR / 'frontend'), 'index.html')
+@app.errorhandler(404)
+def spa_fallback(e):
+    """Unknown non-API paths fall back to the SPA entry point.
+
+    Real static files are handled by Flask's built-in static route, so
+    Python only sees the misses.
+    """
+    if request.path.startswith('/api'):
+        return fast_jsonify({'error': 'not found'}, 404)
+    return app.response_class(_INDEX_HTML, mimetype='text/html')
 
 
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
 
+class SMTPConnection:
+    """Caches one authenticated SMTP session so each email skips the
+    TCP + STARTTLS + login handshake"""
+
+    def __init__(self, host='smtp.gmail.com', port=587):
+        self.host = host
+        self.port = port
+        self._server = None
+        # Reentrant so send_message can run inside a session() block
+        self._lock = threading.RLock()
+
+    def send_message(self, msg):
+        """Send a message over the cached connection, reconnecting if stale"""
+        with self._lock:
+            server = self._ensure_connection()
+            server.send_message(msg)
+
+    @contextlib.contextmanager
+    def session(self):
+        """Hold one SMTP session open across several sends.
+
+        Yields the underlying server (or None when email isn't configured)
+        so a burst of messages pays for at most one handshake.
+        """
+        with self._lock:
+            if not (EMAIL_ADDRESS and EMAIL_PASSWORD):
+                yield None
+            else:
+                yield self._ensure_connection()
+
+    def _ensure_connection(self):
+        if self._server is not None:
+            try:
+                status, _ = self._server.noop()
+                if status == 250:
+                    return self._server
+            except Exception:
+                pass
+            # Stale connection - drop it and reconnect
+            self._close_locked()
+
+        server = smtplib.SMTP(self.host, self.port)
+        server.starttls()
+        server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
+        self._server = server
+        return server
+
+    def close(self):
+        """Close the cached connection (registered with atexit)"""
+        with self._lock:
+            self._close_locked()
+
+    def _close_locked(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+
+smtp_connection = SMTPConnection()
+atexit.register(smtp_connection.close)
+
+# Email HTML templates, compiled once at import time. Rendering joins the
+# pieces in one pass instead of growing a string inside a Python loop.
+_EMAIL_TEMPLATES = jinja2.Environment(
+    loader=jinja2.DictLoader({
+        'portfolio.html': """
+        <html>
+            <body style="font-family: Arial, sans-serif; padding: 20px; background-color: #f4f4f4;">
+                <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 10px;">
+                    <h2 style="color: #667eea;">📊 Portfolio Analysis Complete</h2>
+
+                    <div style="background-color: #e3f2fd; padding: 20px; border-left: 4px solid #2196f3; margin: 20px 0;">
+                        <h3 style="color: #333; margin-top: 0;">Portfolio Summary</h3>
+                        <p><strong>Total Value:</strong> ${{ "%.2f"|format(total_value) }}</p>
+                        <p><strong>Total Assets:</strong> {{ num_assets }}</p>
+                        <p><strong>Active Assets:</strong> {{ num_active }}</p>
+                        <p><strong>Idle Assets:</strong> {{ num_idle }}</p>
+                    </div>
+
+                    <h3 style="color: #333;">Your Assets</h3>
+                    <div style="background-color: #f5f5f5; padding: 15px; border-radius: 5px;">
+                        {% for balance in balances %}
+                        <p style="margin: 10px 0;">
+                            <strong>{{ balance.get('asset_code', 'XLM') }}:</strong> {{ "%.4f"|format(balance.get('balance', '0')|float) }}
+                        </p>
+                        {% endfor %}
+                        {% if extra_assets %}
+                        <p style='color: #666;'>...and {{ extra_assets }} more assets</p>
+                        {% endif %}
+                    </div>
+
+                    <p style="color: #666; font-size: 12px; margin-top: 30px;">
+                        Portfolio data fetched from Stellar Horizon.
+                    </p>
+                </div>
+            </body>
+        </html>
+        """,
+        'opportunities.html': """
+        <html>
+            <body style="font-family: Arial, sans-serif; padding: 20px; background-color: #f4f4f4;">
+                <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 10px;">
+                    <h2 style="color: #667eea;">🚀 DeFi Opportunities for You</h2>
+
+                    <p style="color: #666;">We found {{ count }} opportunities to earn yield on your assets:</p>
+                    {% for opp in opportunities %}
+                    <div style="background-color: #f5f5f5; padding: 20px; margin: 15px 0; border-left: 4px solid #4caf50; border-radius: 5px;">
+                        <h3 style="color: #333; margin-top: 0;">{{ opp.get('title', 'Opportunity') }}</h3>
+                        <p style="color: #666;">{{ opp.get('description', '') }}</p>
+                        <div style="display: flex; gap: 20px; margin-top: 10px;">
+                            <span style="color: #4caf50; font-weight: bold;">APY: {{ opp.get('apy', 'N/A') }}%</span>
+                            <span style="color: #ff9800;">Risk: {{ opp.get('risk', 'N/A') }}</span>
+                        </div>
+                        {% if opp.get('action_url') %}
+                        <a href="{{ opp['action_url'] }}" style="color: #667eea; text-decoration: none;">Learn More →</a>
+                        {% endif %}
+                    </div>
+                    {% endfor %}
+                    <p style="color: #666; font-size: 12px; margin-top: 30px;">
+                        Always do your own research before investing in DeFi protocols.
+                    </p>
+                </div>
+            </body>
+        </html>
+        """,
+    }),
+    autoescape=True
+)
+
+# Notification I/O (SMTP handshake, Twilio REST) takes seconds; run it on a
+# small pool so request handlers return as soon as the data is ready
+NOTIFY_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='notify')
+atexit.register(NOTIFY_EXECUTOR.shutdown)
+
+# Pool for fanning out concurrent Horizon fetches (multi-wallet requests)
+HORIZON_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='horizon')
+atexit.register(HORIZON_EXECUTOR.shutdown)
+
+# Fire-and-forget notification jobs go through this queue; a single worker
+# thread drains it so handlers only pay for a Queue.put
+NOTIFY_QUEUE = queue.Queue()
+
+
+def smtp_session():
+    """Context manager sharing one SMTP session across several sends"""
+    return smtp_connection.session()
+
+
+def _dispatch_notification(kind, payload):
+    """Run one queued notification job"""
+    if kind == 'email':
+        send_email(payload['subject'], payload['body'])
+    elif kind == 'sms':
+        send_sms(payload['message'])
+    elif kind == 'portfolio':
+        send_portfolio_notification(payload['public_key'], payload['portfolio'])
+    elif kind == 'opportunities':
+        send_opportunities_notification(payload['public_key'], payload['opportunities'])
+
+
+def _notification_worker():
+    """Process queued (kind, payload) notification jobs.
+
+    Jobs that queued up together are drained as one batch inside a single
+    SMTP session, so a burst of emails pays for at most one handshake.
+    """
+    while True:
+        jobs = [NOTIFY_QUEUE.get()]
+        try:
+            while True:
+                jobs.append(NOTIFY_QUEUE.get_nowait())
+        except queue.Empty:
+            pass
+
+        try:
+            with smtp_session():
+                for kind, payload in jobs:
+                    try:
+                        _dispatch_notification(kind, payload)
+                    except Exception as e:
+                        logger.warning("⚠️  Notification job '%s' failed: %s", kind, e)
+        except Exception as e:
+            # SMTP session setup failed - still run the jobs so SMS and the
+            # per-send error handling get their chance
+            logger.warning("⚠️  SMTP session failed: %s", e)
+            for kind, payload in jobs:
+                try:
+                    _dispatch_notification(kind, payload)
+                except Exception as e:
+                    logger.warning("⚠️  Notification job '%s' failed: %s", kind, e)
+        finally:
+            for _ in jobs:
+                NOTIFY_QUEUE.task_done()
+
+
+threading.Thread(target=_notification_worker, daemon=True,
+                 name='notify-queue').start()
+
+
 def send_email(subject, body_html):
     """Send email notification"""
     try:
         if not EMAIL_ADDRESS or not EMAIL_PASSWORD or not USER_EMAIL:
-            print("⚠️  Email not configured in .env file")
+            logger.warning("⚠️  Email not configured in .env file")
             return False
 
         msg = MIMEMultipart()
@@ -88,44 +474,37 @@ def send_email(subject, body_html):
 
         msg.attach(MIMEText(body_html, 'html'))
 
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-        server.send_message(msg)
-        server.quit()
+        smtp_connection.send_message(msg)
 
-        print(f"✅ Email sent: {subject}")
+        logger.info("✅ Email sent: %s", subject)
         return True
 
     except Exception as e:
-        print(f"❌ Email failed: {str(e)}")
+        logger.error("❌ Email failed: %s", e)
         return False
 
 
 def send_sms(message):
     """Send SMS notification via Twilio"""
     try:
-        if not TWILIO_ACCOUNT_SID or not TWILIO_AUTH_TOKEN:
-            print("⚠️  SMS not configured in .env file")
+        if TWILIO_CLIENT is None:
+            if TwilioClient is None:
+                logger.warning("⚠️  Twilio not installed. Run: pip install twilio")
+            else:
+                logger.warning("⚠️  SMS not configured in .env file")
             return False
 
-        from twilio.rest import Client
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-
-        message = client.messages.create(
+        sms = TWILIO_CLIENT.messages.create(
             body=message,
             from_=TWILIO_PHONE_NUMBER,
             to=USER_PHONE
         )
 
-        print(f"✅ SMS sent: {message.sid}")
+        logger.info("✅ SMS sent: %s", sms.sid)
         return True
 
-    except ImportError:
-        print("⚠️  Twilio not installed. Run: pip install twilio")
-        return False
     except Exception as e:
-        print(f"❌ SMS failed: {str(e)}")
+        logger.error("❌ SMS failed: %s", e)
         return False
 
 
@@ -137,7 +516,7 @@ def send_sms(message):
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return fast_jsonify({
         'status': 'healthy',
         'service': 'Stellar Compass API',
         'network': HORIZON_URL
@@ -163,12 +542,13 @@ def notify_connection():
 
         wallet_display = wallet_names.get(wallet_type, wallet_type.capitalize())
 
-        print(f"\n🔔 Wallet Connected: {wallet_display}")
-        print(f"   Address: {public_key[:8]}...{public_key[-8:]}")
+        logger.info("\n🔔 Wallet Connected: %s", wallet_display)
+        logger.info("   Address: %s...%s", public_key[:8], public_key[-8:])
 
-        # Send email notification
-        email_subject = f"🌟 Stellar Compass: Wallet Connected Successfully"
-        email_body = f"""
+        # Build and queue the email only when it can actually be delivered
+        if _email_configured():
+            email_subject = f"🌟 Stellar Compass: Wallet Connected Successfully"
+            email_body = f"""
         <html>
             <body style="font-family: Arial, sans-serif; padding: 20px; background-color: #f4f4f4;">
                 <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 10px;">
@@ -197,26 +577,70 @@ def notify_connection():
                 </div>
             </body>
         </html>
-        """
+            """
 
-        send_email(email_subject, email_body)
+            NOTIFY_QUEUE.put(('email', {'subject': email_subject, 'body': email_body}))
 
         # Send SMS notification (if configured)
-        sms_message = f"Stellar Compass: {wallet_display} connected successfully! Address: {public_key[:8]}...{public_key[-8:]}"
-        send_sms(sms_message)
+        if TWILIO_CLIENT is not None:
+            sms_message = f"Stellar Compass: {wallet_display} connected successfully! Address: {public_key[:8]}...{public_key[-8:]}"
+            NOTIFY_QUEUE.put(('sms', {'message': sms_message}))
 
-        return jsonify({
+        return fast_jsonify({
             'success': True,
             'message': 'Notifications sent',
             'wallet_type': wallet_type
         })
 
     except Exception as e:
-        print(f"❌ Notification error: {str(e)}")
-        return jsonify({
+        logger.error("❌ Notification error: %s", e)
+        return fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
+
+
+def _build_portfolio(public_key):
+    """Fetch and analyze one account; returns (portfolio_data, stale)"""
+    # Load account from Stellar (cached for ACCOUNT_CACHE_TTL seconds)
+    account, stale = _fetch_account(public_key)
+
+    balances = account['balances']
+    n = len(balances)
+
+    # Vectorized balance math - parse and value all balances in one C pass
+    # instead of per-item Python float() and arithmetic
+    amounts = np.fromiter((b['balance'] for b in balances),
+                          dtype=np.float64, count=n)
+    codes = np.array([b.get('asset_code', 'XLM') for b in balances])
+
+    # Simplified value calculation: approximate XLM price (update with a
+    # real price API); other assets would need a price oracle
+    values = np.where(codes == 'XLM', amounts * 0.10, 0.0)
+    total_value = float(values.sum())
+    active_mask = amounts > 0
+
+    # Categorize by index (simplified logic) - the frontend indexes into
+    # `balances`, so the same dicts aren't serialized twice
+    active_idx = []
+    idle_idx = []
+    for i, balance in enumerate(balances):
+        balance['value'] = float(values[i])
+        if active_mask[i]:
+            active_idx.append(i)
+        else:
+            idle_idx.append(i)
+
+    portfolio_data = {
+        'public_key': public_key,
+        'balances': balances,
+        'total_value': total_value,
+        'active_idx': active_idx,
+        'idle_idx': idle_idx,
+        'sequence': account['sequence']
+    }
+
+    return portfolio_data, stale
 
 
 @app.route('/api/portfolio/<public_key>', methods=['GET'])
@@ -224,116 +648,134 @@ def notify_connection():
 def get_portfolio(public_key):
     """Get portfolio for a Stellar account"""
     try:
-        print(f"\n🔍 Fetching portfolio for: {public_key[:8]}...{public_key[-8:]}")
+        logger.info("\n🔍 Fetching portfolio for: %s...%s", public_key[:8], public_key[-8:])
 
-        # Load account from Stellar
-        account = horizon.accounts().account_id(public_key).call()
+        portfolio_data, stale = _build_portfolio(public_key)
 
-        balances = account['balances']
-        total_value = 0
-        active_assets = []
-        idle_assets = []
+        logger.info("✅ Portfolio loaded: %d assets, $%.2f total value",
+                    len(portfolio_data['balances']), portfolio_data['total_value'])
 
-        # Process balances
-        for balance in balances:
-            asset_code = balance.get('asset_code', 'XLM')
-            asset_balance = float(balance['balance'])
+        # Send portfolio notification in the background
+        NOTIFY_QUEUE.put(('portfolio', {'public_key': public_key,
+                                        'portfolio': portfolio_data}))
 
-            # Simplified value calculation (you can integrate real price APIs)
-            if asset_code == 'XLM':
-                # Approximate XLM price (update with real API)
-                asset_value = asset_balance * 0.10
-            else:
-                asset_value = 0  # Would need price oracle
-
-            total_value += asset_value
+        response = fast_jsonify(portfolio_data)
+        if stale:
+            response.headers['X-Cache'] = 'stale'
+        return response
 
-            balance['value'] = asset_value
+    except Exception as e:
+        error_msg = str(e)
+        logger.error("❌ Portfolio error: %s", error_msg)
+        return fast_jsonify({
+            'error': error_msg,
+            'public_key': public_key
+        }, 400)
 
-            # Categorize assets (simplified logic)
-            if asset_balance > 0:
-                active_assets.append(balance)
-            else:
-                idle_assets.append(balance)
 
-        portfolio_data = {
-            'public_key': public_key,
-            'balances': balances,
-            'total_value': total_value,
-            'active_assets': active_assets,
-            'idle_assets': idle_assets,
-            'sequence': account['sequence']
-        }
+@app.route('/api/portfolios', methods=['POST'])
+@app.route('/portfolios', methods=['POST'])
+def get_portfolios():
+    """Get portfolios for several accounts in one request.
 
-        print(f"✅ Portfolio loaded: {len(balances)} assets, ${total_value:.2f} total value")
+    Horizon has no multi-account batch GET, so the accounts are fetched
+    concurrently - N parallel round trips instead of N sequential ones.
+    """
+    try:
+        data = request.json or {}
+        public_keys = data.get('public_keys') or []
+        if not public_keys:
+            return fast_jsonify({'error': 'public_keys is required'}, 400)
+
+        logger.info("\n🔍 Fetching %d portfolios...", len(public_keys))
+
+        futures = {pk: HORIZON_EXECUTOR.submit(_build_portfolio, pk)
+                   for pk in public_keys}
+
+        portfolios = []
+        errors = {}
+        for pk, future in futures.items():
+            try:
+                portfolio_data, _ = future.result()
+                portfolios.append(portfolio_data)
+            except Exception as e:
+                errors[pk] = str(e)
+
+        logger.info("✅ Loaded %d portfolios (%d failed)", len(portfolios), len(errors))
+
+        return fast_jsonify({
+            'portfolios': portfolios,
+            'errors': errors,
+            'count': len(portfolios)
+        })
 
-        # Send portfolio notification
-        send_portfolio_notification(public_key, portfolio_data)
+    except Exception as e:
+        logger.error("❌ Batch portfolio error: %s", e)
+        return fast_jsonify({'error': str(e)}, 400)
 
-        return jsonify(portfolio_data)
 
-    except Exception as e:
-        error_msg = str(e)
-        print(f"❌ Portfolio error: {error_msg}")
-        return jsonify({
-            'error': error_msg,
-            'public_key': public_key
-        }), 400
+def _email_configured():
+    """True when there is an email channel to deliver to"""
+    return bool(EMAIL_ADDRESS and EMAIL_PASSWORD and USER_EMAIL)
 
 
 def send_portfolio_notification(public_key, portfolio):
     """Send notification with portfolio summary"""
     try:
-        total_value = portfolio.get('total_value', 0)
-        num_assets = len(portfolio.get('balances', []))
-
-        email_subject = f"📊 Your Stellar Portfolio Summary"
-        email_body = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; padding: 20px; background-color: #f4f4f4;">
-                <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 10px;">
-                    <h2 style="color: #667eea;">📊 Portfolio Analysis Complete</h2>
-                    
-                    <div style="background-color: #e3f2fd; padding: 20px; border-left: 4px solid #2196f3; margin: 20px 0;">
-                        <h3 style="color: #333; margin-top: 0;">Portfolio Summary</h3>
-                        <p><strong>Total Value:</strong> ${total_value:.2f}</p>
-                        <p><strong>Total Assets:</strong> {num_assets}</p>
-                        <p><strong>Active Assets:</strong> {len(portfolio.get('active_assets', []))}</p>
-                        <p><strong>Idle Assets:</strong> {len(portfolio.get('idle_assets', []))}</p>
-                    </div>
-                    
-                    <h3 style="color: #333;">Your Assets</h3>
-                    <div style="background-color: #f5f5f5; padding: 15px; border-radius: 5px;">
-        """
-
-        # Add asset details
-        for balance in portfolio.get('balances', [])[:5]:  # Show first 5 assets
-            asset_code = balance.get('asset_code', 'XLM')
-            asset_balance = balance.get('balance', '0')
-            email_body += f"""
-                        <p style="margin: 10px 0;">
-                            <strong>{asset_code}:</strong> {float(asset_balance):.4f}
-                        </p>
-            """
+        # Skip the template render entirely when there is nowhere to send it
+        if not _email_configured():
+            return
 
-        if len(portfolio.get('balances', [])) > 5:
-            email_body += f"<p style='color: #666;'>...and {len(portfolio.get('balances', [])) - 5} more assets</p>"
+        balances = portfolio.get('balances', [])
 
-        email_body += """
-                    </div>
-                    
-                    <p style="color: #666; font-size: 12px; margin-top: 30px;">
-                        Portfolio data fetched from Stellar Horizon.
-                    </p>
-                </div>
-            </body>
-        </html>
-        """
+        email_subject = "📊 Your Stellar Portfolio Summary"
+        email_body = _EMAIL_TEMPLATES.get_template('portfolio.html').render(
+            total_value=portfolio.get('total_value', 0),
+            num_assets=len(balances),
+            num_active=len(portfolio.get('active_idx', [])),
+            num_idle=len(portfolio.get('idle_idx', [])),
+            balances=balances[:5],  # Show first 5 assets
+            extra_assets=max(0, len(balances) - 5)
+        )
 
         send_email(email_subject, email_body)
 
     except Exception as e:
-        print(f"⚠️  Portfolio notification failed: {str(e)}")
+        logger.warning("⚠️  Portfolio notification failed: %s", e)
+
+
+@functools.lru_cache(maxsize=1)
+def _build_opportunities():
+    """Build the opportunity list once; call cache_clear() to refresh.
+
+    Example opportunities (replace with real DeFi protocol integrations).
+    """
+    return [
+        {
+            'title': 'Aqua Liquidity Rewards',
+            'description': 'Provide liquidity to AMM pools and earn AQUA rewards',
+            'apy': '12.5',
+            'risk': 'Medium',
+            'platform': 'Aquarius',
+            'action_url': 'https://aqua.network'
+        },
+        {
+            'title': 'Ultra Stellar Staking',
+            'description': 'Stake your XLM and earn passive rewards',
+            'apy': '5.2',
+            'risk': 'Low',
+            'platform': 'Ultra Stellar',
+            'action_url': 'https://ultrastellar.com'
+        },
+        {
+            'title': 'Stellar X Trading Fees',
+            'description': 'Earn trading fees by providing liquidity on StellarX',
+            'apy': '8.7',
+            'risk': 'Medium',
+            'platform': 'StellarX',
+            'action_url': 'https://www.stellarx.com'
+        }
+    ]
 
 
 @app.route('/api/opportunities/<public_key>', methods=['GET'])
@@ -341,97 +783,51 @@ def send_portfolio_notification(public_key, portfolio):
 def get_opportunities(public_key):
     """Get DeFi opportunities for account"""
     try:
-        print(f"\n🔍 Finding opportunities for: {public_key[:8]}...{public_key[-8:]}")
-
-        # Example opportunities (replace with real DeFi protocol integrations)
-        opportunities = [
-            {
-                'title': 'Aqua Liquidity Rewards',
-                'description': 'Provide liquidity to AMM pools and earn AQUA rewards',
-                'apy': '12.5',
-                'risk': 'Medium',
-                'platform': 'Aquarius',
-                'action_url': 'https://aqua.network'
-            },
-            {
-                'title': 'Ultra Stellar Staking',
-                'description': 'Stake your XLM and earn passive rewards',
-                'apy': '5.2',
-                'risk': 'Low',
-                'platform': 'Ultra Stellar',
-                'action_url': 'https://ultrastellar.com'
-            },
-            {
-                'title': 'Stellar X Trading Fees',
-                'description': 'Earn trading fees by providing liquidity on StellarX',
-                'apy': '8.7',
-                'risk': 'Medium',
-                'platform': 'StellarX',
-                'action_url': 'https://www.stellarx.com'
-            }
-        ]
-
-        print(f"✅ Found {len(opportunities)} opportunities")
-
-        # Send opportunities notification
-        send_opportunities_notification(public_key, opportunities)
-
-        return jsonify({
+        logger.info("\n🔍 Finding opportunities for: %s...%s", public_key[:8], public_key[-8:])
+
+        opportunities = _build_opportunities()
+
+        logger.info("✅ Found %d opportunities", len(opportunities))
+
+        # Notify at most once per hour per account - dashboard polling
+        # shouldn't re-send the same opportunity email
+        notified_key = f"notified:opps:{public_key}"
+        cached = _cache_read(notified_key)
+        if cached is None or time.time() - cached[1] >= 3600:
+            _cache_write(notified_key, True, time.time(), 3600)
+            NOTIFY_QUEUE.put(('opportunities', {'public_key': public_key,
+                                                'opportunities': opportunities}))
+
+        return fast_jsonify({
             'public_key': public_key,
             'opportunities': opportunities,
             'count': len(opportunities)
         })
 
     except Exception as e:
-        print(f"❌ Opportunities error: {str(e)}")
-        return jsonify({
+        logger.error("❌ Opportunities error: %s", e)
+        return fast_jsonify({
             'error': str(e),
             'opportunities': []
-        }), 400
+        }, 400)
 
 
 def send_opportunities_notification(public_key, opportunities):
     """Send notification about available opportunities"""
     try:
-        if not opportunities:
+        if not opportunities or not _email_configured():
             return
 
         email_subject = f"🚀 {len(opportunities)} DeFi Opportunities Available"
-        email_body = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; padding: 20px; background-color: #f4f4f4;">
-                <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 10px;">
-                    <h2 style="color: #667eea;">🚀 DeFi Opportunities for You</h2>
-                    
-                    <p style="color: #666;">We found {len(opportunities)} opportunities to earn yield on your assets:</p>
-        """
-
-        for opp in opportunities[:3]:  # Show top 3
-            email_body += f"""
-                    <div style="background-color: #f5f5f5; padding: 20px; margin: 15px 0; border-left: 4px solid #4caf50; border-radius: 5px;">
-                        <h3 style="color: #333; margin-top: 0;">{opp.get('title', 'Opportunity')}</h3>
-                        <p style="color: #666;">{opp.get('description', '')}</p>
-                        <div style="display: flex; gap: 20px; margin-top: 10px;">
-                            <span style="color: #4caf50; font-weight: bold;">APY: {opp.get('apy', 'N/A')}%</span>
-                            <span style="color: #ff9800;">Risk: {opp.get('risk', 'N/A')}</span>
-                        </div>
-                        {f'<a href="{opp.get("action_url", "")}" style="color: #667eea; text-decoration: none;">Learn More →</a>' if opp.get('action_url') else ''}
-                    </div>
-            """
-
-        email_body += """
-                    <p style="color: #666; font-size: 12px; margin-top: 30px;">
-                        Always do your own research before investing in DeFi protocols.
-                    </p>
-                </div>
-            </body>
-        </html>
-        """
+        email_body = _EMAIL_TEMPLATES.get_template('opportunities.html').render(
+            count=len(opportunities),
+            opportunities=opportunities[:3]  # Show top 3
+        )
 
         send_email(email_subject, email_body)
 
     except Exception as e:
-        print(f"⚠️  Opportunities notification failed: {str(e)}")
+        logger.warning("⚠️  Opportunities notification failed: %s", e)
 
 
 @app.route('/api/test-notification', methods=['GET'])
@@ -439,7 +835,9 @@ def send_opportunities_notification(public_key, opportunities):
 def test_notification():
     """Test endpoint to verify notifications work"""
     try:
-        email_sent = send_email(
+        # Email and SMS are independent - fire both and join
+        email_future = NOTIFY_EXECUTOR.submit(
+            send_email,
             "🧪 Test Notification from Stellar Compass",
             """
             <html>
@@ -450,22 +848,25 @@ def test_notification():
             </html>
             """
         )
+        sms_future = NOTIFY_EXECUTOR.submit(
+            send_sms, "Test notification from Stellar Compass - Your SMS is working!")
 
-        sms_sent = send_sms("Test notification from Stellar Compass - Your SMS is working!")
+        email_sent = email_future.result()
+        sms_sent = sms_future.result()
 
-        return jsonify({
+        return fast_jsonify({
             'success': True,
             'email_sent': email_sent,
             'sms_sent': sms_sent
         })
 
     except Exception as e:
-        return jsonify({
+        return fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 
 if __name__ == '__main__':
-    print("\n✅ Server ready! Press Ctrl+C to stop.\n")
+    logger.info("\n✅ Server ready! Press Ctrl+C to stop.\n")
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -1,10 +1,69 @@
 import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from twilio.rest import Client
 import os
 from datetime import datetime
 
+# HTML fragments for alert emails. Parsed once at import; each alert joins
+# its parts with "".join instead of concatenating strings piecewise.
+_HTML_HEADER = """
+        <html>
+            <body style="font-family: Arial, sans-serif; color: #333;">
+"""
+
+_HTML_FOOTER = """
+            </body>
+        </html>
+"""
+
+_BUTTON_HTML = """
+                <a href="http://localhost:8080" style="background: {color}; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; margin-top: 10px;">
+                    {label}
+                </a>
+"""
+
+_OPPORTUNITY_HTML = """
+                <h2 style="color: #4F46E5;">🚀 New DeFi Opportunity!</h2>
+                <div style="background: #F3F4F6; padding: 20px; border-radius: 8px; margin: 20px 0;">
+                    <h3 style="margin-top: 0;">{protocol}</h3>
+                    <p><strong>Asset:</strong> {asset}</p>
+                    <p><strong>APY:</strong> <span style="color: #10B981; font-size: 24px;">{apy}%</span></p>
+                    <p><strong>TVL:</strong> ${tvl}</p>
+                    <p><strong>Risk Score:</strong> {risk_score}</p>
+                    <p style="margin-top: 15px;">{description}</p>
+                </div>
+"""
+
+_IDLE_ASSET_HTML = """
+                <h2 style="color: #F59E0B;">💤 Idle Assets Detected</h2>
+                <div style="background: #FEF3C7; padding: 20px; border-radius: 8px; margin: 20px 0;">
+                    <p style="font-size: 18px;"><strong>{asset_count} assets</strong> worth <strong style="color: #D97706; font-size: 24px;">${idle_value:,.2f}</strong> are sitting idle.</p>
+                    <p>These assets could be earning yield in DeFi protocols!</p>
+                </div>
+"""
+
+_RISK_HTML = """
+                <h2 style="color: #EF4444;">⚠️ Security Alert</h2>
+                <div style="background: #FEE2E2; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #EF4444;">
+                    <h3 style="margin-top: 0; color: #991B1B;">{protocol_name}</h3>
+                    <p><strong>Risk Type:</strong> {risk_type}</p>
+                    <p style="margin-top: 15px;">We recommend reviewing your positions in this protocol immediately.</p>
+                </div>
+"""
+
+_PRICE_HTML = """
+                <h2>{direction} Price Movement Alert</h2>
+                <div style="background: #F3F4F6; padding: 20px; border-radius: 8px; margin: 20px 0;">
+                    <h3 style="margin-top: 0;">{asset}</h3>
+                    <p><strong>Price Change:</strong> <span style="color: {change_color}; font-size: 24px;">{price_change:+.1f}%</span></p>
+                    <p><strong>Current Price:</strong> ${current_price:,.4f}</p>
+                </div>
+"""
+
+
 class NotificationService:
     def __init__(self):
         # Email configuration
@@ -23,7 +82,42 @@ class NotificationService:
             self.twilio_client = Client(self.twilio_account_sid, self.twilio_auth_token)
         else:
             self.twilio_client = None
-    
+
+        # Cached SMTP session (reused across sends to skip the handshake).
+        # SMTP is a strict command/response dialogue, so the lock must be
+        # held for the whole send, not just the connection lookup -
+        # interleaved sendmail calls from the dispatch pool would corrupt
+        # the protocol. Reentrant so helpers can nest under a caller's hold.
+        self._smtp = None
+        self._smtp_lock = threading.RLock()
+
+        # Pool for firing email + SMS concurrently per alert
+        self._dispatch_pool = ThreadPoolExecutor(max_workers=2,
+                                                 thread_name_prefix='alerts')
+
+    def _get_smtp(self):
+        """Return a cached authenticated SMTP session, reconnecting if stale"""
+        with self._smtp_lock:
+            if self._smtp is not None:
+                try:
+                    status, _ = self._smtp.noop()
+                    if status == 250:
+                        return self._smtp
+                except Exception:
+                    pass
+                # Connection went stale - drop it and reconnect
+                try:
+                    self._smtp.quit()
+                except Exception:
+                    pass
+                self._smtp = None
+
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+            server.starttls()
+            server.login(self.email_address, self.email_password)
+            self._smtp = server
+            return server
+
     def send_email(self, to_email, subject, message, html_content=None):
         """Send email notification"""
         try:
@@ -45,13 +139,12 @@ class NotificationService:
                 html_part = MIMEText(html_content, 'html')
                 msg.attach(html_part)
             
-            # Send email
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email_address, self.email_password)
-            server.send_message(msg)
-            server.quit()
-            
+            # Send over the cached connection, holding the lock for the
+            # whole SMTP exchange
+            with self._smtp_lock:
+                server = self._get_smtp()
+                server.send_message(msg)
+
             print(f"✅ Email sent to {to_email}")
             return True
             
@@ -59,6 +152,72 @@ class NotificationService:
             print(f"❌ Email error: {str(e)}")
             return False
     
+    @staticmethod
+    def _as_recipient_list(user_emails):
+        """Accept a single address or a list of addresses"""
+        if isinstance(user_emails, str):
+            return [user_emails]
+        return list(user_emails or [])
+
+    def send_bulk_email(self, recipients, subject, message, html_content=None):
+        """Send the same email to many recipients over one SMTP session"""
+        try:
+            if not recipients:
+                return 0
+
+            if not self.email_address or not self.email_password:
+                print("⚠️ Email credentials not configured")
+                return 0
+
+            msg = MIMEMultipart('alternative')
+            msg['From'] = self.email_address
+            msg['Subject'] = subject
+            msg.attach(MIMEText(message, 'plain'))
+            if html_content:
+                msg.attach(MIMEText(html_content, 'html'))
+
+            # One connection for the whole batch - only the To header and
+            # the DATA phase change per recipient. The lock spans the
+            # batch so another thread can't interleave its own commands.
+            sent = 0
+            failed = 0
+            with self._smtp_lock:
+                server = self._get_smtp()
+
+                for recipient in recipients:
+                    try:
+                        del msg['To']
+                        msg['To'] = recipient
+                        server.sendmail(self.email_address, [recipient], msg.as_string())
+                        sent += 1
+                    except Exception as e:
+                        failed += 1
+                        print(f"❌ Email to {recipient} failed: {str(e)}")
+                        # On big batches, give up once a third has failed - the
+                        # server is likely down and retrying just burns time
+                        if len(recipients) >= 30 and failed >= len(recipients) / 3:
+                            print("⚠️ Aborting bulk send - too many failures")
+                            break
+
+            print(f"✅ Bulk email sent to {sent}/{len(recipients)} recipients")
+            return sent
+
+        except Exception as e:
+            print(f"❌ Bulk email error: {str(e)}")
+            return 0
+
+    def _send_alert(self, user_emails, subject, message, html_content,
+                    user_phone, sms_text):
+        """Fire email and SMS for one alert concurrently and join the results"""
+        email_future = self._dispatch_pool.submit(
+            self.send_bulk_email, self._as_recipient_list(user_emails),
+            subject, message, html_content)
+        sms_future = self._dispatch_pool.submit(self.send_sms, user_phone, sms_text)
+
+        email_sent = email_future.result() > 0
+        sms_sent = sms_future.result()
+        return email_sent or sms_sent
+
     def send_sms(self, to_phone, message):
         """Send SMS notification via Twilio"""
         try:
@@ -79,7 +238,7 @@ class NotificationService:
             print(f"❌ SMS error: {str(e)}")
             return False
     
-    def send_opportunity_alert(self, user_email, user_phone, opportunity_data):
+    def send_opportunity_alert(self, user_emails, user_phone, opportunity_data):
         """Send alert about new DeFi opportunity"""
         subject = f"🚀 New {opportunity_data['apy']}% APY Opportunity Found!"
         
@@ -99,32 +258,18 @@ Risk: {opportunity_data['risk_score']}
 Log in to Stellar Compass to take action!
         """
         
-        html_content = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; color: #333;">
-                <h2 style="color: #4F46E5;">🚀 New DeFi Opportunity!</h2>
-                <div style="background: #F3F4F6; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                    <h3 style="margin-top: 0;">{opportunity_data['protocol']}</h3>
-                    <p><strong>Asset:</strong> {opportunity_data['asset']}</p>
-                    <p><strong>APY:</strong> <span style="color: #10B981; font-size: 24px;">{opportunity_data['apy']}%</span></p>
-                    <p><strong>TVL:</strong> ${opportunity_data['tvl']}</p>
-                    <p><strong>Risk Score:</strong> {opportunity_data['risk_score']}</p>
-                    <p style="margin-top: 15px;">{opportunity_data['description']}</p>
-                </div>
-                <a href="http://localhost:8080" style="background: #4F46E5; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; margin-top: 10px;">
-                    View in Stellar Compass
-                </a>
-            </body>
-        </html>
-        """
-        
-        # Send both email and SMS
-        email_sent = self.send_email(user_email, subject, message, html_content)
-        sms_sent = self.send_sms(user_phone, f"Stellar Compass: {opportunity_data['apy']}% APY opportunity in {opportunity_data['protocol']}! Check your email for details.")
+        html_content = "".join([
+            _HTML_HEADER,
+            _OPPORTUNITY_HTML.format(**opportunity_data),
+            _BUTTON_HTML.format(color='#4F46E5', label='View in Stellar Compass'),
+            _HTML_FOOTER,
+        ])
         
-        return email_sent or sms_sent
+        # Email and SMS are independent channels - send them in parallel
+        return self._send_alert(user_emails, subject, message, html_content,
+                                user_phone, f"Stellar Compass: {opportunity_data['apy']}% APY opportunity in {opportunity_data['protocol']}! Check your email for details.")
     
-    def send_idle_asset_alert(self, user_email, user_phone, idle_value, asset_count):
+    def send_idle_asset_alert(self, user_emails, user_phone, idle_value, asset_count):
         """Alert user about idle assets"""
         subject = f"💤 ${idle_value:,.2f} in Idle Assets Detected"
         
@@ -138,27 +283,17 @@ These assets are sitting dormant and missing potential earnings.
 Log in to see personalized recommendations.
         """
         
-        html_content = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; color: #333;">
-                <h2 style="color: #F59E0B;">💤 Idle Assets Detected</h2>
-                <div style="background: #FEF3C7; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                    <p style="font-size: 18px;"><strong>{asset_count} assets</strong> worth <strong style="color: #D97706; font-size: 24px;">${idle_value:,.2f}</strong> are sitting idle.</p>
-                    <p>These assets could be earning yield in DeFi protocols!</p>
-                </div>
-                <a href="http://localhost:8080" style="background: #F59E0B; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; margin-top: 10px;">
-                    See Recommendations
-                </a>
-            </body>
-        </html>
-        """
-        
-        email_sent = self.send_email(user_email, subject, message, html_content)
-        sms_sent = self.send_sms(user_phone, f"Stellar Compass: You have ${idle_value:,.2f} in idle assets. Check your email for opportunities!")
+        html_content = "".join([
+            _HTML_HEADER,
+            _IDLE_ASSET_HTML.format(asset_count=asset_count, idle_value=idle_value),
+            _BUTTON_HTML.format(color='#F59E0B', label='See Recommendations'),
+            _HTML_FOOTER,
+        ])
         
-        return email_sent or sms_sent
+        return self._send_alert(user_emails, subject, message, html_content,
+                                user_phone, f"Stellar Compass: You have ${idle_value:,.2f} in idle assets. Check your email for opportunities!")
     
-    def send_risk_alert(self, user_email, user_phone, protocol_name, risk_type):
+    def send_risk_alert(self, user_emails, user_phone, protocol_name, risk_type):
         """Alert user about protocol risks"""
         subject = f"⚠️ Risk Alert: {protocol_name}"
         
@@ -173,28 +308,17 @@ We recommend reviewing your positions immediately.
 Log in to Stellar Compass for more details.
         """
         
-        html_content = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; color: #333;">
-                <h2 style="color: #EF4444;">⚠️ Security Alert</h2>
-                <div style="background: #FEE2E2; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #EF4444;">
-                    <h3 style="margin-top: 0; color: #991B1B;">{protocol_name}</h3>
-                    <p><strong>Risk Type:</strong> {risk_type}</p>
-                    <p style="margin-top: 15px;">We recommend reviewing your positions in this protocol immediately.</p>
-                </div>
-                <a href="http://localhost:8080" style="background: #EF4444; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; margin-top: 10px;">
-                    Review Positions
-                </a>
-            </body>
-        </html>
-        """
-        
-        email_sent = self.send_email(user_email, subject, message, html_content)
-        sms_sent = self.send_sms(user_phone, f"URGENT - Stellar Compass: Risk detected in {protocol_name}. Check your email immediately!")
+        html_content = "".join([
+            _HTML_HEADER,
+            _RISK_HTML.format(protocol_name=protocol_name, risk_type=risk_type),
+            _BUTTON_HTML.format(color='#EF4444', label='Review Positions'),
+            _HTML_FOOTER,
+        ])
         
-        return email_sent or sms_sent
+        return self._send_alert(user_emails, subject, message, html_content,
+                                user_phone, f"URGENT - Stellar Compass: Risk detected in {protocol_name}. Check your email immediately!")
     
-    def send_price_alert(self, user_email, user_phone, asset, price_change, current_price):
+    def send_price_alert(self, user_emails, user_phone, asset, price_change, current_price):
         """Alert user about significant price movements"""
         direction = "📈" if price_change > 0 else "📉"
         subject = f"{direction} {asset} Price Alert: {price_change:+.1f}%"
@@ -210,23 +334,17 @@ This could affect your portfolio value and yield opportunities.
 Log in to review your positions.
         """
         
-        html_content = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; color: #333;">
-                <h2>{direction} Price Movement Alert</h2>
-                <div style="background: #F3F4F6; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                    <h3 style="margin-top: 0;">{asset}</h3>
-                    <p><strong>Price Change:</strong> <span style="color: {'#10B981' if price_change > 0 else '#EF4444'}; font-size: 24px;">{price_change:+.1f}%</span></p>
-                    <p><strong>Current Price:</strong> ${current_price:,.4f}</p>
-                </div>
-                <a href="http://localhost:8080" style="background: #4F46E5; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; margin-top: 10px;">
-                    View Portfolio
-                </a>
-            </body>
-        </html>
-        """
-        
-        email_sent = self.send_email(user_email, subject, message, html_content)
-        sms_sent = self.send_sms(user_phone, f"Stellar Compass: {asset} {price_change:+.1f}% - ${current_price:,.4f}")
+        html_content = "".join([
+            _HTML_HEADER,
+            _PRICE_HTML.format(
+                direction=direction,
+                asset=asset,
+                change_color='#10B981' if price_change > 0 else '#EF4444',
+                price_change=price_change,
+                current_price=current_price),
+            _BUTTON_HTML.format(color='#4F46E5', label='View Portfolio'),
+            _HTML_FOOTER,
+        ])
         
-        return email_sent or sms_sent
+        return self._send_alert(user_emails, subject, message, html_content,
+                                user_phone, f"Stellar Compass: {asset} {price_change:+.1f}% - ${current_price:,.4f}")
@@ -3,50 +3,150 @@ AI Agent System for Stellar Compass
 Autonomous agents that monitor and alert users
 """
 
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import CancelledError as FutureCancelledError, ThreadPoolExecutor
+from datetime import datetime
 from typing import List, Dict, Optional
+import asyncio
+import heapq
+import itertools
+import logging
+import random
 import threading
 import time
 
+from stellar_cache import ttl_cache
+from stellar_types import Priority, RiskLevel
+
+log = logging.getLogger(__name__)
+
+
+# ============================================
+# DATA FETCHERS
+# ============================================
+# Mock functions - replace with real Horizon / price-oracle calls.
+# TTL-cached so agents polling on overlapping intervals share one fetch
+# instead of hitting the network once per agent. Prices get a short TTL;
+# protocol metadata changes slowly and can live longer.
+
+@ttl_cache(ttl=300)
+def _fetch_idle_assets(wallet_address: str):
+    """Mock function - replace with real data"""
+    return [
+        {'asset': 'XLM', 'days_idle': 45, 'value_usd': 600, 'potential_monthly': 4.8},
+        {'asset': 'USDC', 'days_idle': 33, 'value_usd': 1500, 'potential_monthly': 12}
+    ]
+
+
+@ttl_cache(ttl=300)
+def _fetch_current_opportunities():
+    """Mock function"""
+    return [
+        {'protocol': 'Aquarius', 'apy': 12.5, 'risk': 'MODERATE'},
+        {'protocol': 'Stellar Lend', 'apy': 8.3, 'risk': 'LOW'}
+    ]
+
+
+@ttl_cache(ttl=600)
+def _fetch_risks(wallet_address: str):
+    """Mock function"""
+    return [
+        {
+            'severity': Priority.MEDIUM,
+            'title': 'Portfolio concentration risk',
+            'message': '85% of portfolio in single protocol. Consider diversifying.'
+        }
+    ]
+
+
+@ttl_cache(ttl=300)
+def _fetch_current_allocation(wallet_address: str):
+    """Mock function"""
+    return {RiskLevel.LOW: 0.45, RiskLevel.MODERATE: 0.35, RiskLevel.HIGH: 0.20}
+
+
+@ttl_cache(ttl=300)
+def _fetch_unclaimed_rewards(wallet_address: str):
+    """Mock function"""
+    return [
+        {'protocol': 'Aquarius', 'asset': 'XLM', 'amount': 8.5, 'value_usd': 1.02}
+    ]
+
+
+@ttl_cache(ttl=30)
+def _fetch_current_prices():
+    """Mock function"""
+    return {'XLM': 0.12, 'USDC': 1.00, 'BTC': 45000}
+
+
+# SMS budget: 160 chars minus the longest prefix we prepend
+_SMS_PREFIX_LEN = len("[CRITICAL] Stellar Compass: ")
+SMS_BODY_LIMIT = 160 - _SMS_PREFIX_LEN
+
+_iso_cache = (None, '')
+
+
+def _now_iso_cached() -> str:
+    """ISO timestamp cached at 1-second resolution.
+
+    Alerts only need second precision; caching skips a datetime
+    allocation + strftime-style format on every notify call.
+    """
+    global _iso_cache
+    second = time.time_ns() // 1_000_000_000
+    cached_second, cached_iso = _iso_cache
+    if second != cached_second:
+        cached_iso = datetime.fromtimestamp(second).isoformat()
+        _iso_cache = (second, cached_iso)
+    return cached_iso
+
 
 class BaseAgent:
-    """Base class for all AI agents"""
-    
+    """Base class for all AI agents.
+
+    Agents don't own threads; the orchestrator runs every agent from one
+    shared scheduler, so six agents cost one thread and one wakeup per
+    due check instead of six sleeping threads.
+
+    Slotted (as are all subclasses): many orchestrators x six agents adds
+    up, and slots drop the per-instance __dict__.
+    """
+
+    __slots__ = ('name', 'check_interval', 'is_active', 'last_check',
+                 '_consecutive_errors', '_wake')
+
     def __init__(self, name: str, check_interval_minutes: int = 5):
         self.name = name
         self.check_interval = check_interval_minutes * 60  # Convert to seconds
         self.is_active = False
+        # Monotonic time of the last successful check (cheap float, no
+        # datetime allocation per cycle)
         self.last_check = None
-        self.thread = None
-    
+        self._consecutive_errors = 0
+        # Set by the orchestrator at activation; lets stop() interrupt the
+        # scheduler's wait instead of lingering until the next due time
+        self._wake = None
+
     def start(self):
-        """Start the agent monitoring"""
+        """Mark the agent active (the orchestrator schedules the checks)"""
         self.is_active = True
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
-        self.thread.start()
-    
+
     def stop(self):
-        """Stop the agent"""
+        """Stop the agent; takes effect immediately, not at the next wakeup"""
         self.is_active = False
-    
-    def _run_loop(self):
-        """Main monitoring loop"""
-        while self.is_active:
-            try:
-                self.check()
-                self.last_check = datetime.now()
-                time.sleep(self.check_interval)
-            except Exception as e:
-                print(f"Error in {self.name}: {e}")
-                time.sleep(60)  # Wait a minute before retrying
-    
-    def check(self):
-        """Override this method in subclasses"""
+        if self._wake is not None:
+            self._wake.set()
+
+    def check(self, snapshot: Dict):
+        """Override this method in subclasses; reads from the orchestrator's
+        per-tick data snapshot instead of fetching on its own"""
         raise NotImplementedError
 
 
 class IdleAssetMonitorAgent(BaseAgent):
     """Monitors for idle assets and sends alerts"""
+
+    __slots__ = ('wallet_address', 'notify', 'idle_threshold_days')
     
     def __init__(self, wallet_address: str, notification_callback):
         super().__init__("Idle Asset Monitor", check_interval_minutes=5)
@@ -54,32 +154,26 @@ class IdleAssetMonitorAgent(BaseAgent):
         self.notify = notification_callback
         self.idle_threshold_days = 30
     
-    def check(self):
+    def check(self, snapshot: Dict):
         """Check for idle assets"""
-        # Mock: In production, fetch real wallet data
-        idle_assets = self._get_idle_assets()
+        idle_assets = snapshot['idle_assets']
         
         for asset in idle_assets:
             if asset['days_idle'] >= self.idle_threshold_days:
                 self.notify({
                     'type': 'IDLE_ASSET',
-                    'priority': 'MEDIUM' if asset['days_idle'] < 60 else 'HIGH',
+                    'priority': Priority.MEDIUM if asset['days_idle'] < 60 else Priority.HIGH,
                     'title': f'{asset["asset"]} sitting idle for {asset["days_idle"]} days',
                     'message': f'${asset["value_usd"]:.2f} could be earning ${asset["potential_monthly"]:.2f}/month',
                     'action': 'Activate Now',
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _now_iso_cached()
                 })
-    
-    def _get_idle_assets(self):
-        """Mock function - replace with real data"""
-        return [
-            {'asset': 'XLM', 'days_idle': 45, 'value_usd': 600, 'potential_monthly': 4.8},
-            {'asset': 'USDC', 'days_idle': 33, 'value_usd': 1500, 'potential_monthly': 12}
-        ]
 
 
 class OpportunityScoutAgent(BaseAgent):
     """Finds new yield opportunities and APY spikes"""
+
+    __slots__ = ('wallet_address', 'notify', 'risk_tolerance', 'tracked_apys')
     
     def __init__(self, wallet_address: str, notification_callback, risk_tolerance: str = 'moderate'):
         super().__init__("Opportunity Scout", check_interval_minutes=5)
@@ -88,75 +182,62 @@ class OpportunityScoutAgent(BaseAgent):
         self.risk_tolerance = risk_tolerance
         self.tracked_apys = {}
     
-    def check(self):
+    def check(self, snapshot: Dict):
         """Check for new opportunities"""
-        opportunities = self._get_current_opportunities()
-        
-        for opp in opportunities:
-            protocol = opp['protocol']
-            current_apy = opp['apy']
-            
-            # Check if APY spiked
-            if protocol in self.tracked_apys:
-                previous_apy = self.tracked_apys[protocol]
-                increase = current_apy - previous_apy
-                
-                if increase > 2:  # 2% increase
-                    self.notify({
-                        'type': 'APY_SPIKE',
-                        'priority': 'HIGH',
-                        'title': f'{protocol} APY jumped to {current_apy}%',
-                        'message': f'Up {increase:.1f}% from {previous_apy:.1f}%. Time to invest?',
-                        'action': 'View Details',
-                        'timestamp': datetime.now().isoformat()
-                    })
-            
-            self.tracked_apys[protocol] = current_apy
-    
-    def _get_current_opportunities(self):
-        """Mock function"""
-        return [
-            {'protocol': 'Aquarius', 'apy': 12.5, 'risk': 'MODERATE'},
-            {'protocol': 'Stellar Lend', 'apy': 8.3, 'risk': 'LOW'}
+        opportunities = snapshot['opportunities']
+        tracked = self.tracked_apys
+
+        # One pass to find APY spikes (>2% increase); notification strings
+        # are only built for protocols that actually spiked
+        spikes = [
+            (opp['protocol'], opp['apy'], tracked[opp['protocol']])
+            for opp in opportunities
+            if opp['protocol'] in tracked and opp['apy'] - tracked[opp['protocol']] > 2
         ]
+        tracked.update((opp['protocol'], opp['apy']) for opp in opportunities)
+
+        for protocol, current_apy, previous_apy in spikes:
+            increase = current_apy - previous_apy
+            self.notify({
+                'type': 'APY_SPIKE',
+                'priority': Priority.HIGH,
+                'title': f'{protocol} APY jumped to {current_apy}%',
+                'message': f'Up {increase:.1f}% from {previous_apy:.1f}%. Time to invest?',
+                'action': 'View Details',
+                'timestamp': _now_iso_cached()
+            })
 
 
 class RiskMonitorAgent(BaseAgent):
     """Monitors protocol risks and portfolio health"""
+
+    __slots__ = ('wallet_address', 'notify')
     
     def __init__(self, wallet_address: str, notification_callback):
         super().__init__("Risk Monitor", check_interval_minutes=10)
         self.wallet_address = wallet_address
         self.notify = notification_callback
     
-    def check(self):
+    def check(self, snapshot: Dict):
         """Check for risk issues"""
-        risks = self._check_risks()
+        risks = snapshot['risks']
         
         for risk in risks:
-            if risk['severity'] in ['HIGH', 'CRITICAL']:
+            if risk['severity'] >= Priority.HIGH:
                 self.notify({
                     'type': 'RISK_ALERT',
-                    'priority': 'CRITICAL' if risk['severity'] == 'CRITICAL' else 'HIGH',
+                    'priority': Priority.CRITICAL if risk['severity'] == Priority.CRITICAL else Priority.HIGH,
                     'title': risk['title'],
                     'message': risk['message'],
                     'action': 'Review Position',
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _now_iso_cached()
                 })
-    
-    def _check_risks(self):
-        """Mock function"""
-        return [
-            {
-                'severity': 'MEDIUM',
-                'title': 'Portfolio concentration risk',
-                'message': '85% of portfolio in single protocol. Consider diversifying.'
-            }
-        ]
 
 
 class AutoRebalancerAgent(BaseAgent):
     """Detects portfolio drift and suggests rebalancing"""
+
+    __slots__ = ('wallet_address', 'notify', 'target_allocation', 'drift_threshold')
     
     def __init__(self, wallet_address: str, notification_callback, target_allocation: Dict):
         super().__init__("Auto Rebalancer", check_interval_minutes=60)
@@ -165,9 +246,9 @@ class AutoRebalancerAgent(BaseAgent):
         self.target_allocation = target_allocation
         self.drift_threshold = 0.10  # 10% drift triggers alert
     
-    def check(self):
+    def check(self, snapshot: Dict):
         """Check portfolio balance"""
-        current_allocation = self._get_current_allocation()
+        current_allocation = snapshot['allocation']
         
         for risk_level, target_pct in self.target_allocation.items():
             current_pct = current_allocation.get(risk_level, 0)
@@ -176,20 +257,18 @@ class AutoRebalancerAgent(BaseAgent):
             if drift > self.drift_threshold:
                 self.notify({
                     'type': 'REBALANCE',
-                    'priority': 'MEDIUM',
+                    'priority': Priority.MEDIUM,
                     'title': 'Portfolio needs rebalancing',
                     'message': f'{risk_level} allocation drifted {drift*100:.1f}% from target',
                     'action': 'Rebalance',
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _now_iso_cached()
                 })
-    
-    def _get_current_allocation(self):
-        """Mock function"""
-        return {'LOW': 0.45, 'MODERATE': 0.35, 'HIGH': 0.20}
 
 
 class YieldHarvesterAgent(BaseAgent):
     """Tracks unclaimed rewards and optimal claim times"""
+
+    __slots__ = ('wallet_address', 'notify', 'min_claim_threshold')
     
     def __init__(self, wallet_address: str, notification_callback):
         super().__init__("Yield Harvester", check_interval_minutes=60)
@@ -197,31 +276,27 @@ class YieldHarvesterAgent(BaseAgent):
         self.notify = notification_callback
         self.min_claim_threshold = 1.0  # $1 minimum to claim
     
-    def check(self):
+    def check(self, snapshot: Dict):
         """Check for unclaimed rewards"""
-        unclaimed = self._get_unclaimed_rewards()
+        unclaimed = snapshot['rewards']
         
         total_unclaimed = sum(r['value_usd'] for r in unclaimed)
         
         if total_unclaimed >= self.min_claim_threshold:
             self.notify({
                 'type': 'HARVEST',
-                'priority': 'LOW',
+                'priority': Priority.LOW,
                 'title': f'${total_unclaimed:.2f} in unclaimed rewards',
                 'message': f'Ready to harvest from {len(unclaimed)} protocols',
                 'action': 'Claim All',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _now_iso_cached()
             })
-    
-    def _get_unclaimed_rewards(self):
-        """Mock function"""
-        return [
-            {'protocol': 'Aquarius', 'asset': 'XLM', 'amount': 8.5, 'value_usd': 1.02}
-        ]
 
 
 class PriceMovementAgent(BaseAgent):
     """Monitors significant price movements"""
+
+    __slots__ = ('wallet_address', 'notify', 'price_threshold', 'last_prices')
     
     def __init__(self, wallet_address: str, notification_callback):
         super().__init__("Price Movement Monitor", check_interval_minutes=5)
@@ -230,31 +305,46 @@ class PriceMovementAgent(BaseAgent):
         self.price_threshold = 0.05  # 5% movement triggers alert
         self.last_prices = {}
     
-    def check(self):
+    def check(self, snapshot: Dict):
         """Check for price movements"""
-        current_prices = self._get_current_prices()
-        
-        for asset, price in current_prices.items():
-            if asset in self.last_prices:
-                previous = self.last_prices[asset]
-                change = (price - previous) / previous
-                
-                if abs(change) >= self.price_threshold:
-                    direction = "up" if change > 0 else "down"
-                    self.notify({
-                        'type': 'PRICE_MOVEMENT',
-                        'priority': 'MEDIUM' if abs(change) < 0.10 else 'HIGH',
-                        'title': f'{asset} {direction} {abs(change)*100:.1f}%',
-                        'message': f'Current price: ${price:.4f}',
-                        'action': 'Check Portfolio',
-                        'timestamp': datetime.now().isoformat()
-                    })
-            
-            self.last_prices[asset] = price
-    
-    def _get_current_prices(self):
-        """Mock function"""
-        return {'XLM': 0.12, 'USDC': 1.00, 'BTC': 45000}
+        current_prices = snapshot['prices']
+        prev = self.last_prices
+
+        # One pass to find threshold-crossing moves; in the common case
+        # (nothing moved) no f-strings or alert dicts get built
+        changed = [
+            (asset, price, (price - prev[asset]) / prev[asset])
+            for asset, price in current_prices.items()
+            if asset in prev
+            and abs(price - prev[asset]) >= self.price_threshold * prev[asset]
+        ]
+        prev.update(current_prices)
+
+        for asset, price, change in changed:
+            direction = "up" if change > 0 else "down"
+            self.notify({
+                'type': 'PRICE_MOVEMENT',
+                'priority': Priority.MEDIUM if abs(change) < 0.10 else Priority.HIGH,
+                'title': f'{asset} {direction} {abs(change)*100:.1f}%',
+                'message': f'Current price: ${price:.4f}',
+                'action': 'Check Portfolio',
+                'timestamp': _now_iso_cached()
+            })
+
+
+def _log_dispatch_outcome(future):
+    """Surface failures from alert fan-out; the future is otherwise dropped.
+
+    run_coroutine_threadsafe hands back a concurrent.futures.Future, whose
+    exception() raises concurrent.futures.CancelledError - a separate class
+    from asyncio.CancelledError, so both are handled.
+    """
+    try:
+        exc = future.exception()
+    except (FutureCancelledError, asyncio.CancelledError):
+        return
+    if exc is not None:
+        log.warning("Alert dispatch failed: %s", exc)
 
 
 class AgentOrchestrator:
@@ -267,17 +357,68 @@ class AgentOrchestrator:
         self.phone_number = phone_number
         self.risk_tolerance = risk_tolerance
         self.agents = []
-        self.alert_history = []
-        
+        # Bounded history: deque evicts the oldest alert in O(1) instead
+        # of re-slicing a list on every append past the cap
+        self.alert_history = deque(maxlen=100)
+
+        # Single scheduler shared by every agent: a min-heap of
+        # (due_time, tiebreak, agent) drained by one daemon thread that
+        # sleeps until the nearest due check
+        self._heap = []
+        self._heap_lock = threading.Lock()
+        self._counter = itertools.count()
+        self._wake = threading.Event()
+        self._scheduler = None
+
+        # Dedupe: (type, title) -> last-sent monotonic time, so identical
+        # alerts re-raised within the window don't spam every channel
+        self._recent_fingerprints = {}
+        self._dedupe_window = 900  # seconds
+
+        # Active channels as a frozenset, refreshed in update_settings,
+        # so routing is membership checks instead of three dict.get calls
+        self._active_channels = self._compute_active_channels()
+
+        # Dedicated event loop for notification fan-out: push/email/SMS
+        # for one alert run concurrently instead of serializing on the
+        # scheduler thread; the semaphore bounds in-flight sends.
+        # Created in activate_all_agents alongside the pool and stopped
+        # in deactivate_all_agents, so idle orchestrators don't each
+        # hold a thread for the life of the process.
+        self._loop = None
+        self._loop_thread = None
+        self._send_semaphore = None
+
+        # One bounded pool for all blocking send/fetch work instead of
+        # ad-hoc threads; also serves as the loop's default executor so
+        # run_in_executor(None, ...) lands here. Created in
+        # activate_all_agents, torn down in deactivate_all_agents.
+        self._pool = None
+
         # Target allocation for rebalancer
         self.target_allocation = {
-            'conservative': {'LOW': 0.80, 'MODERATE': 0.20, 'HIGH': 0.00},
-            'moderate': {'LOW': 0.50, 'MODERATE': 0.40, 'HIGH': 0.10},
-            'aggressive': {'LOW': 0.30, 'MODERATE': 0.40, 'HIGH': 0.30}
-        }.get(risk_tolerance.lower(), {'LOW': 0.50, 'MODERATE': 0.40, 'HIGH': 0.10})
+            'conservative': {RiskLevel.LOW: 0.80, RiskLevel.MODERATE: 0.20,
+                             RiskLevel.HIGH: 0.00},
+            'moderate': {RiskLevel.LOW: 0.50, RiskLevel.MODERATE: 0.40,
+                         RiskLevel.HIGH: 0.10},
+            'aggressive': {RiskLevel.LOW: 0.30, RiskLevel.MODERATE: 0.40,
+                           RiskLevel.HIGH: 0.30}
+        }.get(risk_tolerance.lower(),
+              {RiskLevel.LOW: 0.50, RiskLevel.MODERATE: 0.40,
+               RiskLevel.HIGH: 0.10})
     
     def activate_all_agents(self):
         """Start all AI agents"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=8,
+                                            thread_name_prefix='stellar-compass')
+            self._loop = asyncio.new_event_loop()
+            self._loop.set_default_executor(self._pool)
+            self._send_semaphore = asyncio.Semaphore(16)
+            self._loop_thread = threading.Thread(target=self._loop.run_forever,
+                                                 daemon=True, name='alert-dispatch')
+            self._loop_thread.start()
+
         self.agents = [
             IdleAssetMonitorAgent(self.wallet_address, self._handle_notification),
             OpportunityScoutAgent(self.wallet_address, self._handle_notification, self.risk_tolerance),
@@ -287,57 +428,194 @@ class AgentOrchestrator:
             PriceMovementAgent(self.wallet_address, self._handle_notification)
         ]
         
-        for agent in self.agents:
-            agent.start()
-            print(f"✅ {agent.name} activated")
-    
+        now = time.monotonic()
+        with self._heap_lock:
+            for agent in self.agents:
+                agent._wake = self._wake
+                agent.start()
+                # First check is due immediately
+                heapq.heappush(self._heap, (now, next(self._counter), agent))
+                log.info("✅ %s activated", agent.name)
+
+        if self._scheduler is None or not self._scheduler.is_alive():
+            self._scheduler = threading.Thread(target=self._scheduler_loop,
+                                               daemon=True, name='agent-scheduler')
+            self._scheduler.start()
+        self._wake.set()
+
     def deactivate_all_agents(self):
         """Stop all agents"""
         for agent in self.agents:
             agent.stop()
-            print(f"⏹️ {agent.name} deactivated")
-    
+            log.info("⏹️ %s deactivated", agent.name)
+        # Unblock the scheduler so stopped agents drop out right away
+        self._wake.set()
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._loop_thread = None
+            self._send_semaphore = None
+
+    def _collect_snapshot(self) -> Dict:
+        """Gather all the data agents need for one tick in a single batch.
+
+        One fetch per tick instead of one per agent; the fetchers are
+        TTL-cached, so ticks landing inside a TTL window reuse the same
+        data with no new round-trips.
+        """
+        return {
+            'idle_assets': _fetch_idle_assets(self.wallet_address),
+            'opportunities': _fetch_current_opportunities(),
+            'risks': _fetch_risks(self.wallet_address),
+            'allocation': _fetch_current_allocation(self.wallet_address),
+            'rewards': _fetch_unclaimed_rewards(self.wallet_address),
+            'prices': _fetch_current_prices(),
+        }
+
+    def _scheduler_loop(self):
+        """Run every active agent's checks from one thread.
+
+        Sleeps until the earliest due time on the heap; `_wake` interrupts
+        the wait when the schedule changes (activation, deactivation).
+        """
+        while True:
+            with self._heap_lock:
+                delay = self._heap[0][0] - time.monotonic() if self._heap else None
+
+            if delay is None:
+                # Nothing scheduled - wait for an activation
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            if delay > 0:
+                if self._wake.wait(delay):
+                    # Schedule changed - re-evaluate the heap top
+                    self._wake.clear()
+                    continue
+
+            with self._heap_lock:
+                _, _, agent = heapq.heappop(self._heap)
+
+            if not agent.is_active:
+                continue  # Stopped while queued - drop from the schedule
+
+            try:
+                agent.check(self._collect_snapshot())
+                agent.last_check = time.monotonic()
+                agent._consecutive_errors = 0
+                next_due = time.monotonic() + agent.check_interval
+            except Exception as e:
+                log.warning("Error in %s: %s", agent.name, e)
+                # Exponential backoff (60s, 120s, ... capped at the check
+                # interval) with +/-20% jitter so agents failing against
+                # the same outage don't retry in lockstep
+                agent._consecutive_errors += 1
+                backoff = min(agent.check_interval,
+                              60 * 2 ** (agent._consecutive_errors - 1))
+                backoff *= random.uniform(0.8, 1.2)
+                next_due = time.monotonic() + backoff
+
+            with self._heap_lock:
+                heapq.heappush(self._heap, (next_due, next(self._counter), agent))
+    
+    def _compute_active_channels(self) -> frozenset:
+        """Snapshot which channels are enabled"""
+        defaults = {'push': True, 'email': True, 'sms': False}
+        return frozenset(
+            ch for ch, default in defaults.items()
+            if self.notification_channels.get(ch, default)
+        )
+
     def _handle_notification(self, alert: Dict):
         """Process and route notifications"""
-        # Add to history
+        # Dedupe: the same condition re-detected every tick (e.g. an idle
+        # asset that stays idle) only fans out once per window
+        now = time.monotonic()
+        fingerprint = (alert['type'], alert['title'])
+        last_sent = self._recent_fingerprints.get(fingerprint, 0)
+        if now - last_sent < self._dedupe_window:
+            return
+
+        # Sweep expired fingerprints while inserting: titles embed
+        # dynamic numbers ("XLM up 6.2%"), so without pruning the dict
+        # grows for the orchestrator's lifetime. An expired entry can't
+        # suppress anything anymore, so dropping it is free.
+        expired = [fp for fp, ts in self._recent_fingerprints.items()
+                   if now - ts >= self._dedupe_window]
+        for fp in expired:
+            del self._recent_fingerprints[fp]
+        self._recent_fingerprints[fingerprint] = now
+
+        # Add to history (deque drops the oldest past 100)
         self.alert_history.append(alert)
-        
-        # Keep only last 100 alerts
-        if len(self.alert_history) > 100:
-            self.alert_history = self.alert_history[-100:]
-        
-        print(f"🔔 Alert: [{alert['priority']}] {alert['title']}")
-        
-        # Route to appropriate channels
-        if self.notification_channels.get('push', True):
-            self._send_push_notification(alert)
-        
-        if self.notification_channels.get('email', True):
-            self._send_email_notification(alert)
-        
-        if self.notification_channels.get('sms', False) and alert['priority'] in ['HIGH', 'CRITICAL']:
-            self._send_sms_notification(alert)
+
+        log.info("🔔 Alert: [%s] %s", alert['priority'], alert['title'])
+
+        # Fan out to the enabled channels off the scheduler thread.
+        # Copy the loop reference: deactivate can null it concurrently.
+        loop = self._loop
+        if loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._dispatch(alert), loop)
+        future.add_done_callback(_log_dispatch_outcome)
+
+    async def _dispatch(self, alert: Dict):
+        """Send one alert to every enabled channel concurrently.
+
+        The _send_* methods will block on real FCM/SendGrid/Twilio calls,
+        so they run in the loop's executor and are awaited together - the
+        fan-out costs max(send) instead of sum(send).
+        """
+        async with self._send_semaphore:
+            loop = asyncio.get_running_loop()
+            sends = []
+
+            if 'push' in self._active_channels:
+                sends.append(loop.run_in_executor(
+                    None, self._send_push_notification, alert))
+
+            if 'email' in self._active_channels:
+                sends.append(loop.run_in_executor(
+                    None, self._send_email_notification, alert))
+
+            if 'sms' in self._active_channels and alert['priority'] >= Priority.HIGH:
+                sends.append(loop.run_in_executor(
+                    None, self._send_sms_notification, alert))
+
+            if sends:
+                await asyncio.gather(*sends)
     
     def _send_push_notification(self, alert: Dict):
         """Send push notification (implement with FCM/APNS)"""
-        print(f"  📱 Push: {alert['message']}")
+        log.debug("  📱 Push: %s", alert['message'])
     
     def _send_email_notification(self, alert: Dict):
         """Send email notification (implement with SendGrid/SES)"""
-        print(f"  📧 Email: {alert['message']}")
+        log.debug("  📧 Email: %s", alert['message'])
     
     def _send_sms_notification(self, alert: Dict):
         """Send SMS notification (implement with Twilio)"""
         if not self.phone_number:
             return
-        
-        # Truncate for SMS (160 chars)
-        sms_message = f"[{alert['priority']}] Stellar Compass: {alert['message'][:120]}"
-        print(f"  📱 SMS to {self.phone_number}: {sms_message}")
+
+        # Truncate to the SMS budget only when the message overflows it
+        body = alert['message']
+        if len(body) > SMS_BODY_LIMIT:
+            body = body[:SMS_BODY_LIMIT]
+        sms_message = f"[{alert['priority']}] Stellar Compass: {body}"
+        log.debug("  📱 SMS to %s: %s", self.phone_number, sms_message)
     
     def get_recent_alerts(self, limit: int = 20) -> List[Dict]:
         """Get recent alerts"""
-        return self.alert_history[-limit:]
+        return list(self.alert_history)[-limit:]
     
     def update_settings(self, settings: Dict):
         """Update agent settings"""
@@ -355,5 +633,7 @@ class AgentOrchestrator:
         
         if 'pushNotifications' in settings:
             self.notification_channels['push'] = settings['pushNotifications']
-        
-        print(f"⚙️ Settings updated for {self.wallet_address}")
+
+        self._active_channels = self._compute_active_channels()
+
+        log.info("⚙️ Settings updated for %s", self.wallet_address)
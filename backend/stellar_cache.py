@@ -0,0 +1,85 @@
+"""
+TTL Cache for Stellar Compass
+Small in-process cache with per-entry expiry and LRU eviction
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable
+import functools
+import threading
+import time
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded cache where every entry expires after its TTL.
+
+    Backed by an OrderedDict so the least-recently-used entry is evicted
+    first when the cache is full. Expiry uses time.monotonic() so clock
+    adjustments can't resurrect or kill entries. Thread-safe.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value, or default when missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if time.monotonic() >= expires:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        """Store a value; ttl overrides the cache default for this entry"""
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """Drop one key, or everything when no key is given"""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+
+def ttl_cache(ttl: float = 60.0, maxsize: int = 128) -> Callable:
+    """Memoize a function with a TTL, keyed by its positional and keyword args.
+
+    Like functools.lru_cache but entries expire, so repeated fetches inside
+    the TTL window hit memory while stale data still gets refreshed.
+    """
+    def decorator(fn: Callable) -> Callable:
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs) -> Any:
+            key = (args, frozenset(kwargs.items())) if kwargs else args
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = fn(*args, **kwargs)
+                cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.invalidate
+        return wrapper
+
+    return decorator
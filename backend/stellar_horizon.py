@@ -4,13 +4,72 @@ Handles all interactions with the Stellar blockchain
 """
 
 import requests
+import ssl
+import threading
+from concurrent.futures import Future
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import List, Dict, Optional
 
+from stellar_cache import TTLCache
+
+# Fast JSON parsing when available (C tokenizer, 2-5x stdlib on the
+# larger Horizon payloads); stdlib json otherwise
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
+# Fast ISO-8601 parsing when available (C parser, well ahead of
+# fromisoformat plus the 'Z' suffix munging); stdlib otherwise
+try:
+    import ciso8601
+    _parse_dt = ciso8601.parse_datetime
+except ImportError:
+    def _parse_dt(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# Incremental JSON parsing when available: lets first-record scans stop
+# reading a large page early instead of decoding the whole body
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Transaction fields we project out of Horizon records
+_FIELDS = ('id', 'created_at', 'source_account', 'successful')
+
+# One SSLContext for the process: its session-ticket cache survives pool
+# reconnects, so TLS resumes with an abbreviated handshake after idle
+# timeouts instead of starting from scratch
+_SSL_CONTEXT = ssl.create_default_context()
+
+
+class _TLSAdapter(HTTPAdapter):
+    """HTTPAdapter wired to the shared SSLContext"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = _SSL_CONTEXT
+        return super().init_poolmanager(*args, **kwargs)
+
 
 class StellarHorizonClient:
     """Client for interacting with Stellar Horizon API"""
-    
+
+    # Mock prices - in production, use a price oracle like CoinGecko.
+    # Built once at class definition, read-only so no caller can mutate it
+    _PRICES = MappingProxyType({
+        'XLM': 0.12,
+        'USDC': 1.00,
+        'USDT': 1.00,
+        'BTC': 45000.00,
+        'ETH': 2500.00
+    })
+
     def __init__(self, network='testnet'):
         """
         Initialize Horizon client
@@ -25,32 +84,105 @@ class StellarHorizonClient:
         
         self.session = requests.Session()
         self.session.headers.update({
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'Connection': 'keep-alive',
+            'Accept-Encoding': 'gzip'
         })
+
+        # Sized connection pool with retries: repeated Horizon calls reuse
+        # one TCP+TLS connection instead of paying the handshake per
+        # request, and transient 429/5xx responses get retried with backoff
+        adapter = _TLSAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=frozenset(['GET'])
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Short-TTL cache: rapid UI refreshes for the same account hit
+        # memory instead of re-issuing the same Horizon GET
+        self._balance_cache = TTLCache(maxsize=1024, ttl=10)
+
+        # In-flight requests keyed by (endpoint, args), so concurrent
+        # callers asking for the same data share one Horizon round trip
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _single_flight(self, key: tuple, fetch):
+        """Run fetch() once for concurrent callers sharing the same key.
+
+        The first caller becomes the owner and performs the request;
+        everyone else blocks on the owner's Future and gets the same
+        result (or exception).
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                owner = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            try:
+                result = fetch()
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
     
-    def get_account_balances(self, public_key: str) -> List[Dict]:
+    def get_account_snapshot(self, public_key: str) -> Dict:
         """
-        Get all balances for an account
+        Get balances plus last-activity info in one Horizon request
+        
+        The /accounts/{pk} response already carries last_modified_time,
+        so dashboard refreshes don't need a second /transactions hop.
         
         Args:
             public_key: Stellar public key
             
         Returns:
-            List of balance objects with asset, balance, and value
+            Dict with balances, last_ledger, and last_modified_time
         """
+        cached = self._balance_cache.get(public_key)
+        if cached is not None:
+            return cached
+
+        return self._single_flight(
+            ('snap', public_key),
+            lambda: self._fetch_snapshot(public_key)
+        )
+
+    def _fetch_snapshot(self, public_key: str) -> Dict:
+        """Issue the /accounts request behind get_account_snapshot"""
         try:
             response = self.session.get(f"{self.horizon_url}/accounts/{public_key}")
             response.raise_for_status()
             
-            account_data = response.json()
+            account_data = _loads(response.content)
             balances = []
-            
+            _get_price = self._PRICES.get
+
             for balance in account_data.get('balances', []):
                 asset_code = balance.get('asset_code', 'XLM')
                 asset_balance = float(balance.get('balance', 0))
-                
-                # Get USD value (mock for now, in production use price oracle)
-                usd_value = self._get_asset_price(asset_code) * asset_balance
+
+                usd_value = _get_price(asset_code, 0.10) * asset_balance
                 
                 balances.append({
                     'asset': asset_code,
@@ -59,11 +191,39 @@ class StellarHorizonClient:
                     'asset_type': balance.get('asset_type', 'native')
                 })
             
-            return balances
+            snapshot = {
+                'balances': balances,
+                'last_ledger': account_data.get('last_modified_ledger'),
+                'last_modified_time': account_data.get('last_modified_time')
+            }
+            self._balance_cache.set(public_key, snapshot)
+            return snapshot
             
         except requests.exceptions.RequestException as e:
             print(f"Error fetching balances: {e}")
-            return self._get_mock_balances()
+            return {
+                'balances': self._get_mock_balances(),
+                'last_ledger': None,
+                'last_modified_time': None
+            }
+
+    def get_account_balances(self, public_key: str) -> List[Dict]:
+        """
+        Get all balances for an account
+        
+        Thin wrapper over get_account_snapshot for existing callers.
+        
+        Args:
+            public_key: Stellar public key
+            
+        Returns:
+            List of balance objects with asset, balance, and value
+        """
+        return self.get_account_snapshot(public_key)['balances']
+
+    def invalidate(self, public_key: str):
+        """Drop cached data for an account (call after write paths)"""
+        self._balance_cache.invalidate(public_key)
     
     def get_account_transactions(self, public_key: str, limit: int = 200) -> List[Dict]:
         """
@@ -76,6 +236,13 @@ class StellarHorizonClient:
         Returns:
             List of transaction objects
         """
+        return self._single_flight(
+            ('tx', public_key, limit),
+            lambda: self._fetch_transactions(public_key, limit)
+        )
+
+    def _fetch_transactions(self, public_key: str, limit: int) -> List[Dict]:
+        """Issue the /transactions request behind get_account_transactions"""
         try:
             response = self.session.get(
                 f"{self.horizon_url}/accounts/{public_key}/transactions",
@@ -83,17 +250,16 @@ class StellarHorizonClient:
             )
             response.raise_for_status()
             
-            data = response.json()
+            data = _loads(response.content)
+
+            # Project just the fields callers use, parsing created_at
+            # once here so downstream code never re-parses the string
             transactions = []
-            
             for tx in data.get('_embedded', {}).get('records', []):
-                transactions.append({
-                    'id': tx.get('id'),
-                    'created_at': tx.get('created_at'),
-                    'source_account': tx.get('source_account'),
-                    'successful': tx.get('successful')
-                })
-            
+                record = {field: tx.get(field) for field in _FIELDS}
+                created_at = record['created_at']
+                record['created_at_dt'] = _parse_dt(created_at) if created_at else None
+                transactions.append(record)
             return transactions
             
         except requests.exceptions.RequestException as e:
@@ -111,16 +277,54 @@ class StellarHorizonClient:
         Returns:
             Datetime of last transaction or None
         """
-        transactions = self.get_account_transactions(public_key, limit=50)
-        
-        if not transactions:
+        created_at = self._get_latest_tx_created_at(public_key)
+        if created_at is None:
             return None
-        
-        # Return most recent transaction date
-        if transactions:
-            return datetime.fromisoformat(transactions[0]['created_at'].replace('Z', '+00:00'))
-        
-        return None
+
+        return _parse_dt(created_at)
+
+    def _get_latest_tx_created_at(self, public_key: str, limit: int = 1) -> Optional[str]:
+        """Fetch only the newest transaction's created_at.
+
+        limit=1&order=desc transfers one record instead of a page of 50
+        that gets thrown away. For scans where a larger page is needed
+        (limit > 1), the body is stream-parsed when ijson is installed,
+        so parsing stops at the first record instead of decoding the
+        whole page.
+        """
+        params = {'limit': limit, 'order': 'desc', 'include_failed': 'false'}
+        url = f"{self.horizon_url}/accounts/{public_key}/transactions"
+
+        try:
+            if limit > 1 and ijson is not None:
+                return self._stream_first_created_at(url, params)
+
+            response = self.session.get(url, params=params)
+            response.raise_for_status()
+
+            records = _loads(response.content).get('_embedded', {}).get('records', [])
+            return records[0]['created_at'] if records else None
+
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching transactions: {e}")
+            return None
+
+    def _stream_first_created_at(self, url: str, params: Dict) -> Optional[str]:
+        """Stream a transactions page and stop at the first created_at"""
+        response = self.session.get(url, params=params, stream=True)
+        try:
+            response.raise_for_status()
+            # The session asks for gzip and requests only decompresses via
+            # content/iter_content - tell urllib3 to decode here too, or
+            # ijson would be handed raw gzip bytes
+            response.raw.decode_content = True
+            for created_at in ijson.items(response.raw, '_embedded.records.item.created_at'):
+                return created_at
+            return None
+        finally:
+            # Release the connection back to the keep-alive pool even
+            # though the body was abandoned part-way through
+            response.close()
     
     def _get_asset_price(self, asset_code: str) -> float:
         """
@@ -132,15 +336,7 @@ class StellarHorizonClient:
         Returns:
             Price in USD
         """
-        # Mock prices - in production, use a price oracle like CoinGecko
-        prices = {
-            'XLM': 0.12,
-            'USDC': 1.00,
-            'USDT': 1.00,
-            'BTC': 45000.00,
-            'ETH': 2500.00
-        }
-        return prices.get(asset_code, 0.10)
+        return self._PRICES.get(asset_code, 0.10)
     
     def _get_mock_balances(self) -> List[Dict]:
         """Return mock balances for testing"""
@@ -191,6 +387,9 @@ class StellarHorizonClient:
         Returns:
             Transaction object
         """
+        # A payment changes the source balances - make the next read fresh
+        self.invalidate(source)
+
         return {
             'source': source,
             'destination': destination,
@@ -0,0 +1,135 @@
+"""
+Async Stellar Horizon API Client
+aiohttp-based variant of StellarHorizonClient for concurrent fan-out:
+fetching N accounts costs ~one round-trip of wall time instead of N
+"""
+
+import asyncio
+from typing import List, Dict
+
+import aiohttp
+
+from stellar_horizon import StellarHorizonClient
+
+
+class AsyncStellarHorizonClient:
+    """Async client for interacting with Stellar Horizon API"""
+
+    # Same mock price table as the sync client - one source of truth
+    _PRICES = StellarHorizonClient._PRICES
+
+    def __init__(self, network='testnet'):
+        """
+        Initialize async Horizon client
+
+        Args:
+            network: 'testnet' or 'mainnet'
+        """
+        if network == 'testnet':
+            self.horizon_url = 'https://horizon-testnet.stellar.org'
+        else:
+            self.horizon_url = 'https://horizon.stellar.org'
+
+        # Created lazily so the connector binds to the running event loop
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=32,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers={
+                    'Content-Type': 'application/json',
+                    'Accept-Encoding': 'gzip'
+                }
+            )
+        return self._session
+
+    async def close(self):
+        """Close the underlying session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def get_account_balances(self, public_key: str) -> List[Dict]:
+        """
+        Get all balances for an account
+
+        Args:
+            public_key: Stellar public key
+
+        Returns:
+            List of balance objects with asset, balance, and value
+        """
+        session = await self._get_session()
+        async with session.get(f"{self.horizon_url}/accounts/{public_key}") as response:
+            response.raise_for_status()
+            account_data = await response.json()
+
+        balances = []
+        for balance in account_data.get('balances', []):
+            asset_code = balance.get('asset_code', 'XLM')
+            asset_balance = float(balance.get('balance', 0))
+
+            # Get USD value (mock for now, in production use price oracle)
+            usd_value = self._get_asset_price(asset_code) * asset_balance
+
+            balances.append({
+                'asset': asset_code,
+                'balance': asset_balance,
+                'value_usd': usd_value,
+                'asset_type': balance.get('asset_type', 'native')
+            })
+
+        return balances
+
+    async def get_account_transactions(self, public_key: str, limit: int = 200) -> List[Dict]:
+        """
+        Get recent transactions for an account
+
+        Args:
+            public_key: Stellar public key
+            limit: Number of transactions to fetch
+
+        Returns:
+            List of transaction objects
+        """
+        session = await self._get_session()
+        async with session.get(
+            f"{self.horizon_url}/accounts/{public_key}/transactions",
+            params={'limit': limit, 'order': 'desc'}
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+
+        return [
+            {
+                'id': tx.get('id'),
+                'created_at': tx.get('created_at'),
+                'source_account': tx.get('source_account'),
+                'successful': tx.get('successful')
+            }
+            for tx in data.get('_embedded', {}).get('records', [])
+        ]
+
+    async def get_many_balances(self, public_keys: List[str]) -> List[List[Dict]]:
+        """
+        Fetch balances for several accounts concurrently
+
+        Args:
+            public_keys: Stellar public keys
+
+        Returns:
+            Balance lists in the same order as public_keys
+        """
+        return await asyncio.gather(
+            *(self.get_account_balances(pk) for pk in public_keys)
+        )
+
+    def _get_asset_price(self, asset_code: str) -> float:
+        """Get current USD price for an asset (mock)"""
+        return self._PRICES.get(asset_code, 0.10)
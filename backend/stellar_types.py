@@ -0,0 +1,29 @@
+"""
+Shared enums for Stellar Compass
+Risk levels and alert priorities as IntEnums - ordered comparisons are
+single integer compares instead of string equality against rebuilt lists
+"""
+
+from enum import IntEnum
+
+
+class RiskLevel(IntEnum):
+    """Protocol risk classification, ordered from safest to riskiest"""
+    LOW = 1
+    MODERATE = 2
+    HIGH = 3
+    CRITICAL = 4
+
+    def __str__(self):
+        return self.name
+
+
+class Priority(IntEnum):
+    """Alert priority, ordered from least to most urgent"""
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    CRITICAL = 4
+
+    def __str__(self):
+        return self.name
@@ -9,26 +9,29 @@ from pathlib import Path
 
 def build_exe():
     """Build Windows executable"""
-    
+
     print("""
     ╔════════════════════════════════════════════════╗
     ║   🔨 Building Stellar Compass Desktop App    ║
     ╚════════════════════════════════════════════════╝
     """)
-    
+
     project_dir = Path(__file__).parent
-    
-    # Simple PyInstaller build
+
+    # One-folder build: --onedir skips the bootloader's per-launch
+    # self-extraction to a temp dir (1-3s cold start plus AV rescans),
+    # and skipping --clean lets PyInstaller reuse its analysis cache
+    # between builds
     args = [
         'stellar_compass.py',
         '--name=StellarCompass',
-        '--onefile',
+        '--onedir',
         '--console',  # Show console with startup info
-        
+
         # Include data folders
         '--add-data=frontend;frontend',
         '--add-data=backend;backend',
-        
+
         # Hidden imports
         '--hidden-import=flask',
         '--hidden-import=flask_cors',
@@ -36,34 +39,37 @@ def build_exe():
         '--hidden-import=dotenv',
         '--hidden-import=email.mime.text',
         '--hidden-import=email.mime.multipart',
-        
-        # Clean build
-        '--clean',
+        '--hidden-import=waitress',
+
+        # Trim stdlib packages the app never touches
+        '--exclude-module=tkinter',
+        '--exclude-module=unittest',
+        '--exclude-module=pydoc',
+
         '--noconfirm'
     ]
-    
+
     # Add icon if exists
     if os.path.exists('icon.ico'):
         args.append('--icon=icon.ico')
         print("📦 Building with custom icon...")
     else:
         print("📦 Building without icon (create icon.ico for custom icon)")
-    
+
     print("\n🔨 Running PyInstaller...")
     print("⏳ This may take 2-3 minutes...\n")
-    
+
     PyInstaller.__main__.run(args)
-    
+
     print("\n" + "=" * 50)
     print("✅ BUILD COMPLETE!")
     print("=" * 50)
-    print(f"\n📁 Executable: {project_dir / 'dist' / 'StellarCompass.exe'}")
-    print(f"📏 Size: ~40-50MB")
+    print(f"\n📁 App folder: {project_dir / 'dist' / 'StellarCompass'}")
     print("\n📝 To distribute:")
-    print("   1. Copy dist/StellarCompass.exe")
-    print("   2. Create .env file in same folder as .exe")
-    print("   3. Share both files")
-    print("\n🚀 Double-click StellarCompass.exe to run!")
+    print("   1. Zip the dist/StellarCompass folder")
+    print("   2. Create .env file next to StellarCompass.exe inside it")
+    print("   3. Share the zip")
+    print("\n🚀 Double-click StellarCompass.exe inside the folder to run!")
     print("\n" + "=" * 50)
 
 if __name__ == '__main__':
@@ -4,9 +4,11 @@ Main entry point for the desktop app
 """
 
 import webview
+import socket
 import threading
 import sys
 import os
+import time
 from pathlib import Path
 
 # Add backend to path
@@ -16,6 +18,24 @@ sys.path.insert(0, str(backend_path))
 # Import Flask app
 from backend.app import app
 
+
+def _wait_ready(host='127.0.0.1', port=5000, timeout=10.0):
+    """Poll until the server accepts connections (or the timeout passes).
+
+    Flask usually binds in well under a second; probing every 50 ms gets
+    the window up as soon as it's really ready instead of sleeping a
+    fixed few seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.05).close()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
 class StellarCompassApp:
     def __init__(self):
         self.window = None
@@ -23,7 +43,12 @@ class StellarCompassApp:
         
     def start_flask(self):
         """Start Flask server in a separate thread"""
-        app.run(host='127.0.0.1', port=5000, debug=False, use_reloader=False)
+        if os.environ.get('DEV'):
+            app.run(host='127.0.0.1', port=5000, debug=False, use_reloader=False)
+        else:
+            from waitress import serve
+            serve(app, host='127.0.0.1', port=5000, threads=8,
+                  connection_limit=200, channel_timeout=30)
     
     def on_closing(self):
         """Handle window closing"""
@@ -38,10 +63,10 @@ class StellarCompassApp:
         self.server_thread = threading.Thread(target=self.start_flask, daemon=True)
         self.server_thread.start()
         
-        # Wait a moment for Flask to start
-        import time
-        time.sleep(2)
-        
+        # Open the window as soon as the server is accepting connections
+        if not _wait_ready():
+            print("⚠️  Backend didn't come up within 10s, opening anyway...")
+
         # Create desktop window
         self.window = webview.create_window(
             title='Stellar Compass - DeFi Assistant',
@@ -318,13 +318,13 @@ async function loadPortfolio() {
 
         console.log('✅ Portfolio loaded:', data);
 
-        // Backend returns `balances` (not `assets`) and provides `total_value`, `idle_assets` etc.
+        // Backend returns `balances` (not `assets`) plus `total_value` and index lists like `idle_idx`
         const balances = data.balances || [];
 
         // Update portfolio display
         document.getElementById('total-value').textContent = `$${(data.total_value || 0).toFixed(2)}`;
         document.getElementById('asset-count').textContent = balances.length;
-        document.getElementById('idle-count').textContent = (data.idle_assets || []).length;
+        document.getElementById('idle-count').textContent = (data.idle_idx || []).length;
 
         // Display assets
         const assetsList = document.getElementById('assets-list');
@@ -4,6 +4,7 @@ Works with your existing backend/app.py
 """
 
 import webbrowser
+import socket
 import subprocess
 import sys
 import os
@@ -11,6 +12,23 @@ import time
 import threading
 from pathlib import Path
 
+
+def _wait_ready(host='127.0.0.1', port=5000, timeout=10.0):
+    """Poll until the server accepts connections (or the timeout passes).
+
+    Flask usually binds in well under a second; probing every 50 ms gets
+    the browser open as soon as it's really ready instead of counting
+    down a fixed five seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.05).close()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
 def start_flask():
     """Start Flask server"""
     try:
@@ -27,7 +45,15 @@ def start_flask():
         
         # Import and run the Flask app
         import app
-        app.app.run(host='127.0.0.1', port=5000, debug=False, use_reloader=False, threaded=True)
+        if os.environ.get('DEV'):
+            # Werkzeug dev server: auto-reload and debugger for development
+            app.app.run(host='127.0.0.1', port=5000, debug=False, use_reloader=False, threaded=True)
+        else:
+            # Production WSGI server: async acceptor + worker pool instead
+            # of Werkzeug's per-request thread spawn
+            from waitress import serve
+            serve(app.app, host='127.0.0.1', port=5000, threads=8,
+                  connection_limit=200, channel_timeout=30)
         
     except Exception as e:
         print(f"\n❌ Error starting backend: {e}")
@@ -82,18 +108,11 @@ def main():
     flask_thread = threading.Thread(target=start_flask, daemon=True)
     flask_thread.start()
     
-    # Wait for server to start
-    print("⏳ Initializing (this takes a few seconds)...")
-    for i in range(5, 0, -1):
-        print(f"   {i}...")
-        time.sleep(1)
-    
-    # Test if server is running
-    try:
-        import urllib.request
-        urllib.request.urlopen('http://127.0.0.1:5000/health', timeout=2)
+    # Wait for the server to accept connections
+    print("⏳ Initializing...")
+    if _wait_ready():
         print("✅ Backend is running!")
-    except:
+    else:
         print("⚠️  Backend might still be starting...")
     
     # Open in browser (app mode)
@@ -120,26 +139,25 @@ def main():
             break
 
     if browser_path:
-        try:
-            # Launch directly using subprocess (more reliable than `start` for --app)
-            subprocess.Popen([
-                browser_path,
-                f'--app={url}',
-                '--new-window',
-                '--window-size=1200,800'
-            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=True)
+        # Persistent profile: a stable dir keeps Chrome's disk cache
+        # and GPU shader cache warm between launches, so the window
+        # opens noticeably faster after the first run
+        profile = Path(os.environ.get('LOCALAPPDATA', Path.home())) / 'StellarCompass' / 'chrome-profile'
+        profile.mkdir(parents=True, exist_ok=True)
 
-            print("✅ Application opened in app mode")
+        # Launch directly using subprocess (more reliable than `start` for --app)
+        subprocess.Popen([
+            browser_path,
+            f'--app={url}',
+            f'--user-data-dir={profile}',
+            '--no-first-run',
+            '--no-default-browser-check',
+            '--new-window',
+            '--window-size=1200,800'
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=True,
+            creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
 
-        except Exception:
-            # Fallback to start (older Windows behavior)
-            try:
-                os.system(f'start "" "{browser_path}" --app={url} --window-size=1200,800 --new-window')
-                print("✅ Application opened (fallback start)")
-            except Exception:
-                webbrowser.open(url)
-                print("✅ Application opened in default browser")
-                print("💡 Tip: Install Chrome or Edge for the best desktop app experience")
+        print("✅ Application opened in app mode")
     else:
         # No supported browser found, open default
         webbrowser.open(url)